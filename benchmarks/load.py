@@ -0,0 +1,618 @@
+"""
+End-to-end load test: throughput, latency percentiles and database queries per request.
+
+Seeds a dedicated database (``--database``, created and migrated when needed) with ``--users``
+users owning ``--aliases`` aliases, then runs one scenario after another against the app:
+
+    redirect     GET /{short_code}, short codes drawn from a Zipf distribution (--zipf)
+    create       POST /api/v1/aliases
+    list         GET /api/v1/aliases, first page
+    statistics   GET /api/v1/statistics, first page
+    mixed        all of the above, weighted by --mix
+
+By default the app runs in this process, with its startup and shutdown handlers, and is
+called directly as an ASGI app, so the load generator and the app share one CPU. With
+``--server`` it runs as a uvicorn process with ``--workers`` workers and is driven over
+HTTP keep-alive connections; the generator is one process, so check its CPU column before
+reading a throughput number as the server's limit.
+
+Without ``--rate``, ``--concurrency`` requests are kept in flight. With ``--rate``, requests
+are started at that rate, at most ``--concurrency`` at a time, and latency is measured from
+when each request was due, so time spent waiting for a slow server shows in the
+percentiles. Every request comes from its own client address (X-Forwarded-For over HTTP),
+so the rate limiter runs but does not reject.
+
+Queries per request are read from url_alias_db_query_duration_seconds on /metrics before
+and after each scenario, so they include background writes such as click flushes; they
+are only reported with METRICS_ENABLED.
+
+    make load-test-baseline
+    make load-test
+    uv run python benchmarks/load.py --scenario redirect --rate 1000 --server --workers 4
+    uv run python benchmarks/load.py --aliases 1000000 --compare benchmarks/results/load-baseline.json
+
+The seeded database is reused while --users and --aliases stay the same, and rebuilt when
+they change or with --reseed. Aliases added by the create scenario stay in it.
+"""
+
+import argparse
+import asyncio
+import base64
+import bisect
+import contextlib
+import itertools
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from results import RESULTS_DIR, compare, read_results, write_results  # noqa: E402
+
+SCENARIOS = ("redirect", "create", "list", "statistics", "mixed")
+EXPECTED_STATUS = {"redirect": 302, "create": 201, "list": 200, "statistics": 200}
+PASSWORD = "load-test-password"
+TARGET_URL = "https://example.com/articles/"
+QUERY_COUNT_METRIC = "url_alias_db_query_duration_seconds_count"
+COMPARED_METRICS = [
+    ("requests_per_second", False),
+    ("p50_ms", True),
+    ("p95_ms", True),
+    ("p99_ms", True),
+    ("queries_per_request", True),
+]
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        operation, _, weight = part.partition("=")
+        if operation not in EXPECTED_STATUS or not weight:
+            raise argparse.ArgumentTypeError(f"expected operation=weight, operations: {', '.join(EXPECTED_STATUS)}")
+        mix[operation] = float(weight)
+    return mix
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS, help="scenario to run, repeatable (default: all)"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight")
+    parser.add_argument("--rate", type=float, help="start this many requests per second instead")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default="redirect=90,create=4,list=3,statistics=3",
+        help="operation weights of the mixed scenario",
+    )
+    parser.add_argument("--zipf", type=float, default=1.1, help="exponent of the redirect popularity distribution")
+    parser.add_argument("--users", type=int, default=100, help="users to seed, each sends authenticated requests")
+    parser.add_argument("--aliases", type=int, default=100_000, help="aliases to seed")
+    parser.add_argument("--database", default="url_alias_load", help="database to seed and run against")
+    parser.add_argument("--reseed", action="store_true", help="rebuild the database even if it is seeded")
+    parser.add_argument("--server", action="store_true", help="run the app under uvicorn and send HTTP requests")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --server")
+    parser.add_argument("--port", type=int, default=8765, help="uvicorn port with --server")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "load.json"), help="where to write the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="change that counts as a regression")
+    args = parser.parse_args()
+
+    from url_alias.shared.config import get_config
+
+    # Read before main() points POSTGRES_DB at the load test database.
+    if args.database == get_config().db.POSTGRES_DB:
+        parser.error(f"--database {args.database} is the application's database, it would be dropped and reseeded")
+    return args
+
+
+def subprocess_env(**extra: str) -> dict[str, str]:
+    paths = [str(ROOT / "src")] + [path for path in os.environ.get("PYTHONPATH", "").split(os.pathsep) if path]
+    return {**os.environ, "PYTHONPATH": os.pathsep.join(paths), **extra}
+
+
+def popularity(aliases: int) -> list[int]:
+    """Alias ids from most to least popular, the same in every run with the same --aliases."""
+    alias_ids = list(range(1, aliases + 1))
+    random.Random(0).shuffle(alias_ids)
+    return alias_ids
+
+
+async def prepare_database(args: argparse.Namespace) -> None:
+    """Create, migrate and seed the database, unless it already holds a dataset of the requested size."""
+    import asyncpg
+
+    from url_alias.shared.config import get_config
+
+    dsn = get_config().db.asyncpg_dsn
+    dataset = json.dumps({"users": args.users, "aliases": args.aliases}, sort_keys=True)
+
+    maintenance = await asyncpg.connect(dsn, database="postgres")
+    try:
+        seeded = await maintenance.fetchval(
+            "SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = $1", args.database
+        )
+        if seeded == dataset and not args.reseed:
+            return
+        print(f"Seeding {args.aliases} aliases for {args.users} users into database {args.database}...")
+        await maintenance.execute(f'DROP DATABASE IF EXISTS "{args.database}" WITH (FORCE)')
+        await maintenance.execute(f'CREATE DATABASE "{args.database}"')
+    finally:
+        await maintenance.close()
+
+    migration = subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"], cwd=ROOT, env=subprocess_env(), capture_output=True
+    )
+    if migration.returncode:
+        sys.exit(migration.stderr.decode())
+
+    connection = await asyncpg.connect(dsn)
+    try:
+        await seed(connection, args)
+        await connection.execute("VACUUM ANALYZE")
+        # Written last, so an interrupted seed is redone by the next run.
+        await connection.execute(f"COMMENT ON DATABASE \"{args.database}\" IS '{dataset}'")
+    finally:
+        await connection.close()
+
+
+async def seed(connection, args: argparse.Namespace) -> None:
+    from url_alias.domains.aliases.utils import generate_short_code_from_id
+    from url_alias.domains.users.security import pwd_context
+
+    await connection.execute(
+        "INSERT INTO users (id, username, hashed_password, is_active) "
+        "SELECT g, 'load_user_' || g, $1, true FROM generate_series(1, $2) AS g",
+        pwd_context.hash(PASSWORD),
+        args.users,
+    )
+    # Aliases are spread evenly over the users and over the last 30 days, and never expire.
+    # Total clicks follow the redirect popularity order: 1 000 000 / rank.
+    now = datetime.now(timezone.utc)
+    clicks = [0] * (args.aliases + 1)
+    for rank, alias_id in enumerate(popularity(args.aliases), start=1):
+        clicks[alias_id] = 1_000_000 // rank
+    chunk = 50_000
+    for start in range(1, args.aliases + 1, chunk):
+        alias_ids = range(start, min(start + chunk, args.aliases + 1))
+        await connection.copy_records_to_table(
+            "aliases",
+            columns=["id", "target_url", "short_code", "user_id", "is_enabled", "created_at", "updated_at"],
+            records=[
+                (
+                    alias_id,
+                    TARGET_URL + str(alias_id),
+                    generate_short_code_from_id(alias_id),
+                    1 + alias_id % args.users,
+                    True,
+                    now - timedelta(minutes=alias_id % 43_200),
+                    now,
+                )
+                for alias_id in alias_ids
+            ],
+        )
+        await connection.copy_records_to_table(
+            "alias_statistics",
+            columns=["alias_id", "user_id", "total_clicks", "last_clicked_at"],
+            records=[(alias_id, 1 + alias_id % args.users, clicks[alias_id], now) for alias_id in alias_ids],
+        )
+    # The most popular 1% also have clicks in the sliding hour and day windows.
+    await connection.execute(
+        "INSERT INTO alias_click_buckets (alias_id, bucket_start, clicks) "
+        "SELECT s.alias_id, date_trunc('minute', now()) - m * interval '1 minute', 1 "
+        "FROM alias_statistics s CROSS JOIN generate_series(0, 1439, 60) AS m WHERE s.total_clicks >= $1",
+        1_000_000 // max(1, args.aliases // 100),
+    )
+    await connection.execute("SELECT setval('users_id_seq', $1)", args.users)
+    await connection.execute("SELECT setval('aliases_id_seq', $1)", args.aliases)
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    client: str
+
+
+@dataclass
+class Sample:
+    operation: str
+    latency: float
+    status: int
+
+
+class Workload:
+    """Builds the requests of each operation from the seeded dataset."""
+
+    def __init__(self, args: argparse.Namespace):
+        from url_alias.domains.aliases.utils import generate_short_code_from_id
+
+        self.rng = random.Random(1)
+        self.requests = 0
+        self.redirect_paths = ["/" + generate_short_code_from_id(alias_id) for alias_id in popularity(args.aliases)]
+        self.popularity = list(itertools.accumulate(1 / rank**args.zipf for rank in range(1, args.aliases + 1)))
+        self.authorizations = [
+            b"Basic " + base64.b64encode(("load_user_" + str(user_id) + ":" + PASSWORD).encode())
+            for user_id in range(1, args.users + 1)
+        ]
+
+    def client_address(self) -> str:
+        # A new address for every request keeps every client under the rate limit.
+        self.requests += 1
+        number = self.requests
+        return f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}"
+
+    def authorization(self) -> tuple[bytes, bytes]:
+        return (b"authorization", self.rng.choice(self.authorizations))
+
+    def build(self, operation: str) -> Request:
+        if operation == "redirect":
+            rank = bisect.bisect(self.popularity, self.rng.random() * self.popularity[-1])
+            return Request("GET", self.redirect_paths[rank], [], b"", self.client_address())
+        if operation == "create":
+            body = json.dumps({"target_url": TARGET_URL + "load/" + str(self.requests)}).encode()
+            headers = [self.authorization(), (b"content-type", b"application/json")]
+            return Request("POST", "/api/v1/aliases", headers, body, self.client_address())
+        if operation == "list":
+            return Request("GET", "/api/v1/aliases?page_size=20", [self.authorization()], b"", self.client_address())
+        return Request("GET", "/api/v1/statistics?page_size=20", [self.authorization()], b"", self.client_address())
+
+
+class AsgiClient:
+    """Calls the app the way uvicorn would, without sockets or HTTP parsing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, request: Request) -> tuple[int, bytes]:
+        path, _, query = request.path.partition("?")
+        headers = [(b"host", b"localhost"), (b"content-length", str(len(request.body)).encode())] + request.headers
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": headers,
+            "client": (request.client, 40000),
+            "server": ("localhost", 80),
+        }
+        status = 0
+        body = []
+        body_sent = False
+        response_complete = asyncio.Event()
+
+        async def receive() -> dict:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": request.body, "more_body": False}
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        await self.app(scope, receive, send)
+        return status, b"".join(body)
+
+    async def close(self) -> None:
+        pass
+
+
+class HttpClient:
+    """HTTP/1.1 keep-alive connections to a local server, one request at a time on each."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def request(self, request: Request) -> tuple[int, bytes]:
+        if self.idle:
+            try:
+                return await self.exchange(*self.idle.pop(), request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass  # The server closed the idle connection; retry on a new one.
+        return await self.exchange(*await asyncio.open_connection(self.host, self.port), request)
+
+    async def exchange(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: Request
+    ) -> tuple[int, bytes]:
+        try:
+            lines = [
+                f"{request.method} {request.path} HTTP/1.1".encode(),
+                b"host: " + self.host.encode(),
+                b"x-forwarded-for: " + request.client.encode(),
+                b"content-length: " + str(len(request.body)).encode(),
+            ] + [name + b": " + value for name, value in request.headers]
+            writer.write(b"\r\n".join(lines) + b"\r\n\r\n" + request.body)
+            head = await reader.readuntil(b"\r\n\r\n")
+            status_line, *header_lines = head.decode("latin-1").split("\r\n")
+            headers = dict(line.lower().split(": ", 1) for line in header_lines if line)
+            if headers.get("transfer-encoding") == "chunked":
+                raise ValueError("chunked responses are not supported")
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        except BaseException:
+            writer.close()
+            raise
+        if headers.get("connection") == "close":
+            writer.close()
+        else:
+            self.idle.append((reader, writer))
+        return int(status_line.split()[1]), body
+
+    async def close(self) -> None:
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_server(args: argparse.Namespace) -> AsyncIterator[HttpClient]:
+    log = tempfile.TemporaryFile()
+    command = [sys.executable, "-m", "uvicorn", "url_alias.main:app", "--host", "127.0.0.1"]
+    command += ["--port", str(args.port), "--workers", str(args.workers), "--no-access-log"]
+    command += ["--forwarded-allow-ips", "127.0.0.1"]
+    process = subprocess.Popen(command, cwd=ROOT, env=subprocess_env(), stdout=log, stderr=subprocess.STDOUT)
+    client = HttpClient("127.0.0.1", args.port)
+    try:
+        for _ in range(120):
+            if process.poll() is not None:
+                log.seek(0)
+                sys.exit("uvicorn exited:\n" + log.read().decode(errors="replace"))
+            try:
+                status, _ = await client.request(Request("GET", "/", [], b"", "127.0.0.1"))
+                if status == 200:
+                    break
+            except (OSError, asyncio.IncompleteReadError):
+                pass
+            await asyncio.sleep(0.5)
+        else:
+            sys.exit("uvicorn did not start within 60 seconds")
+        yield client
+    finally:
+        await client.close()
+        process.terminate()
+        process.wait(timeout=30)
+        log.close()
+
+
+async def count_queries(client) -> Optional[float]:
+    status, body = await client.request(Request("GET", "/metrics", [], b"", "127.0.0.1"))
+    if status != 200:
+        return None
+    return sum(
+        float(line.rsplit(" ", 1)[1])
+        for line in body.decode().splitlines()
+        if line.startswith(QUERY_COUNT_METRIC + "{") or line.startswith(QUERY_COUNT_METRIC + " ")
+    )
+
+
+async def verify_credentials(client, workload: Workload, args: argparse.Namespace) -> None:
+    """Authenticate every user before measuring, so bcrypt only runs on auth cache misses."""
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def verify(authorization: bytes) -> None:
+        async with slots:
+            await client.request(
+                Request("GET", "/api/v1/users/me", [(b"authorization", authorization)], b"", "127.0.0.1")
+            )
+
+    # Concurrent misses for one user all run bcrypt, so each round sends one request per user.
+    # Any worker may get a round's request; a few rounds reach most of them.
+    for _ in range(2 * args.workers if args.server else 1):
+        await asyncio.gather(*(verify(authorization) for authorization in workload.authorizations))
+
+
+async def drive(client, workload: Workload, mix: dict[str, float], seconds: float, args) -> tuple[list[Sample], float]:
+    operations = list(mix)
+    weights = list(mix.values())
+    samples: list[Sample] = []
+
+    async def send(due: float) -> None:
+        operation = workload.rng.choices(operations, weights)[0]
+        try:
+            status, _ = await client.request(workload.build(operation))
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            status = 0
+        samples.append(Sample(operation, time.perf_counter() - due, status))
+
+    started = time.perf_counter()
+    deadline = started + seconds
+    if args.rate is None:
+
+        async def user() -> None:
+            while time.perf_counter() < deadline:
+                await send(time.perf_counter())
+
+        await asyncio.gather(*(user() for _ in range(args.concurrency)))
+    else:
+        slots = asyncio.Semaphore(args.concurrency)
+        in_flight: set[asyncio.Task] = set()
+
+        def finished(task: asyncio.Task) -> None:
+            in_flight.discard(task)
+            slots.release()
+
+        for number in itertools.count():
+            due = started + number / args.rate
+            if due >= deadline:
+                break
+            if due > time.perf_counter():
+                await asyncio.sleep(due - time.perf_counter())
+            await slots.acquire()
+            task = asyncio.create_task(send(due))
+            in_flight.add(task)
+            task.add_done_callback(finished)
+        await asyncio.gather(*in_flight)
+    return samples, time.perf_counter() - started
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted latencies, in milliseconds."""
+    return latencies[max(0, math.ceil(fraction * len(latencies)) - 1)] * 1000
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    if not samples:
+        return {"requests": 0}
+    latencies = sorted(sample.latency for sample in samples)
+    statuses = Counter(str(sample.status) for sample in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(sample.status != EXPECTED_STATUS[sample.operation] for sample in samples),
+        "statuses": dict(sorted(statuses.items())),
+        "requests_per_second": len(samples) / elapsed,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+async def run_scenario(client, workload: Workload, mix: dict[str, float], args, settle: float) -> dict[str, dict]:
+    await drive(client, workload, mix, args.warmup, args)
+    # Clicks are written in the background; count the warmup's before and the scenario's after.
+    await asyncio.sleep(settle)
+    queries_before = await count_queries(client)
+    cpu_started = time.process_time()
+    samples, elapsed = await drive(client, workload, mix, args.duration, args)
+    cpu = time.process_time() - cpu_started
+    await asyncio.sleep(settle)
+    queries_after = await count_queries(client)
+
+    summary = summarize(samples, elapsed)
+    summary["process_cpu_percent"] = cpu / elapsed * 100
+    if queries_before is not None and queries_after is not None and samples:
+        summary["queries_per_request"] = (queries_after - queries_before) / len(samples)
+    results = {"": summary}
+    if len(mix) > 1:
+        for operation in mix:
+            results["." + operation] = summarize(
+                [sample for sample in samples if sample.operation == operation], elapsed
+            )
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    from url_alias.shared.config import get_config
+
+    await prepare_database(args)
+    workload = Workload(args)
+    settle = get_config().clicks.CLICK_FLUSH_INTERVAL_SECONDS + 0.5
+    scenarios = {name: {name: 1.0} for name in EXPECTED_STATUS}
+    scenarios["mixed"] = args.mix
+
+    async with contextlib.AsyncExitStack() as stack:
+        if args.server:
+            client = await stack.enter_async_context(uvicorn_server(args))
+        else:
+            from url_alias.main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = AsgiClient(app)
+        await verify_credentials(client, workload, args)
+
+        results = {}
+        for name in args.scenario or SCENARIOS:
+            print(f"running {name}...", file=sys.stderr)
+            for suffix, summary in (await run_scenario(client, workload, scenarios[name], args, settle)).items():
+                results[name + suffix] = summary
+        return results
+
+
+def print_results(results: dict[str, dict], args: argparse.Namespace) -> None:
+    columns = [
+        # label, key, width, decimals
+        ("requests", "requests", 10, 0),
+        ("errors", "errors", 8, 0),
+        ("requests/s", "requests_per_second", 12, 1),
+        ("p50 ms", "p50_ms", 10, 2),
+        ("p95 ms", "p95_ms", 10, 2),
+        ("p99 ms", "p99_ms", 10, 2),
+        ("queries/req", "queries_per_request", 12, 2),
+        ("CPU %", "process_cpu_percent", 8, 0),
+    ]
+    mode = f"uvicorn with {args.workers} workers" if args.server else "in-process"
+    load = "rate=" + format(args.rate, "g") if args.rate else "concurrency=" + str(args.concurrency)
+    print(f"{mode}, {load}, users={args.users} aliases={args.aliases} zipf={args.zipf}")
+    print("".ljust(24) + "".join(label.rjust(width) for label, _, width, _ in columns))
+    for case, summary in results.items():
+        print(
+            case.ljust(24)
+            + "".join(
+                format(summary[key], f">{width}.{decimals}f") if key in summary else "-".rjust(width)
+                for _, key, width, decimals in columns
+            )
+        )
+    if args.server and any(summary.get("process_cpu_percent", 0) > 90 for summary in results.values()):
+        print("warning: the load generator used a full core, the server may not be the bottleneck", file=sys.stderr)
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ["POSTGRES_DB"] = args.database
+    # Fresh per run, shared with the server's workers, so /metrics only sums this run's processes.
+    os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="url-alias-load-metrics-")
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
+
+    print_results(results, args)
+    parameters = {
+        name: getattr(args, name)
+        for name in (
+            "server",
+            "workers",
+            "duration",
+            "warmup",
+            "concurrency",
+            "rate",
+            "mix",
+            "zipf",
+            "users",
+            "aliases",
+        )
+    }
+    write_results(args.output, "load", results, parameters)
+    print(f"results written to {args.output}")
+
+    if args.compare:
+        print(f"\ncompared with {args.compare} (threshold {round(args.threshold * 100)}%)")
+        if compare(read_results(args.compare), read_results(args.output), COMPARED_METRICS, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
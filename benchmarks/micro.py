@@ -0,0 +1,240 @@
+"""
+Microbenchmarks of the short code codec, URL and schema validation, and the statistics
+service, without a database.
+
+Every case runs a fixed batch of operations over the same deterministic inputs, ``--repeat``
+times; the best and the median time per operation are recorded. Results are written as
+JSON. With ``--compare`` the run is checked against a stored baseline, and the script exits
+with status 1 if the median time of any case got slower by more than ``--threshold``. The
+median is compared because a single lucky run moves the best one, and a case over the
+threshold is measured again up to ``--retries`` times, keeping the faster result, so that a
+moment of load on the machine is not reported as a regression.
+
+    make benchmark-baseline                      # store benchmarks/results/micro-baseline.json
+    make benchmark                               # run, and compare if a baseline is stored
+    uv run python benchmarks/micro.py --filter base62 --compare benchmarks/results/micro-baseline.json
+
+Baselines are only meaningful on the machine that recorded them.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import timeit
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+# Settings require database credentials even though nothing here connects.
+for name, value in {
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+    "POSTGRES_DB": "benchmark",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "LOG_LEVEL": "WARNING",
+    "METRICS_DIR": os.path.join(tempfile.gettempdir(), f"url-alias-benchmark-metrics-{os.getpid()}"),
+}.items():
+    os.environ.setdefault(name, value)
+
+from results import RESULTS_DIR, compare, read_results, write_results  # noqa: E402
+
+BATCH = 1_000
+BASE_URL = "http://localhost:8000"
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], object]
+    operations: int
+
+
+class FakeStatisticRepository:
+    """StatisticRepository.get_statistics_summary over rows held in memory, in leaderboard order."""
+
+    def __init__(self, rows: list):
+        self.rows = sorted(rows, key=lambda row: (row.total_clicks, row.alias_id), reverse=True)
+
+    async def get_statistics_summary(self, user_id, now, sort_order="desc", limit=100, offset=0, after=None):
+        rows = self.rows if sort_order == "desc" else self.rows[::-1]
+        if after is not None:
+            rows = [row for row in rows if ((row.total_clicks, row.alias_id) < after) == (sort_order == "desc")]
+        end = offset + limit
+        return rows[offset:end]
+
+
+def build_cases() -> list[Case]:
+    # Imported first, it sets up the models in dependency order.
+    from url_alias.main import app  # noqa: F401  # isort: skip
+    from url_alias.domains.aliases.schemas import AliasCreateRequest, AliasRead, validate_target_url
+    from url_alias.domains.aliases.utils import (
+        MAX_ALIAS_ID,
+        decode_base62,
+        encode_base62,
+        generate_short_code_from_id,
+        short_code_to_alias_id,
+    )
+    from url_alias.domains.statistics.aggregator import ClickAggregator
+    from url_alias.domains.statistics.services import StatisticService
+
+    rng = random.Random(0)
+    alias_ids = [rng.randrange(1, MAX_ALIAS_ID) for _ in range(BATCH)]
+    short_codes = [generate_short_code_from_id(alias_id) for alias_id in alias_ids]
+    scrambled = [decode_base62(short_code) for short_code in short_codes]
+    urls = [
+        f"https://example{number % 50}.com/articles/{number}?utm_source=newsletter&ref={'x' * (number % 200)}"
+        for number in range(BATCH)
+    ]
+    create_payloads = [{"target_url": url, "expires_at": "2030-01-01T00:00:00Z", "is_enabled": True} for url in urls]
+    now = datetime.now(timezone.utc)
+    read_fields = [
+        dict(
+            id=alias_id,
+            created_at=now,
+            updated_at=now,
+            target_url=url,
+            short_url=f"{BASE_URL}/{short_code}",
+            user_id=1,
+            expires_at=now,
+            is_enabled=True,
+        )
+        for alias_id, url, short_code in zip(alias_ids, urls, short_codes)
+    ]
+
+    def encode() -> None:
+        for number in scrambled:
+            encode_base62(number)
+
+    def decode() -> None:
+        for short_code in short_codes:
+            decode_base62(short_code)
+
+    def generate() -> None:
+        for alias_id in alias_ids:
+            generate_short_code_from_id(alias_id)
+
+    def to_alias_id() -> None:
+        for short_code in short_codes:
+            short_code_to_alias_id(short_code)
+
+    def validate() -> None:
+        for url in urls:
+            validate_target_url(url)
+
+    def create_request() -> None:
+        for payload in create_payloads:
+            AliasCreateRequest.model_validate(payload)
+
+    def read_response() -> None:
+        for fields in read_fields:
+            AliasRead(**fields).model_dump(mode="json")
+
+    loop = asyncio.new_event_loop()
+    service = StatisticService(session=None)
+    service.click_aggregator = ClickAggregator(flush_interval_seconds=3600, max_pending=2 * BATCH)
+    service.statistic_read_repository = FakeStatisticRepository(
+        [
+            SimpleNamespace(
+                alias_id=alias_id,
+                short_code=short_code,
+                target_url=url,
+                last_hour_clicks=number % 60,
+                last_day_clicks=number % 1440,
+                total_clicks=rng.randrange(0, 100_000),
+            )
+            for number, (alias_id, short_code, url) in enumerate(zip(alias_ids, short_codes, urls))
+        ]
+    )
+    next_cursor = loop.run_until_complete(service.get_statistics_summary(1, BASE_URL, limit=100)).next_cursor
+
+    async def record_clicks() -> None:
+        for alias_id in alias_ids:
+            await service.record_click(alias_id)
+
+    async def summary_pages() -> None:
+        await service.get_statistics_summary(1, BASE_URL, limit=100)
+        await service.get_statistics_summary(1, BASE_URL, limit=100, cursor=next_cursor)
+
+    return [
+        Case("base62.encode", encode, BATCH),
+        Case("base62.decode", decode, BATCH),
+        Case("short_code.generate", generate, BATCH),
+        Case("short_code.to_alias_id", to_alias_id, BATCH),
+        Case("validate_target_url", validate, BATCH),
+        Case("schemas.alias_create_request", create_request, BATCH),
+        Case("schemas.alias_read_dump", read_response, BATCH),
+        Case("statistics.record_click", lambda: loop.run_until_complete(record_clicks()), BATCH),
+        Case("statistics.summary_page_100", lambda: loop.run_until_complete(summary_pages()), 2),
+    ]
+
+
+def measure(case: Case, repeat: int) -> dict[str, float]:
+    timer = timeit.Timer(case.run)
+    number, _ = timer.autorange()
+    runs = [elapsed / (number * case.operations) * 1e9 for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {"ns_per_op": min(runs), "median_ns_per_op": statistics.median(runs)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=str(RESULTS_DIR / "micro.json"), help="where to write the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="median slowdown that counts as a regression")
+    parser.add_argument("--repeat", type=int, default=15, help="timing runs per case")
+    parser.add_argument(
+        "--retries", type=int, default=2, help="with --compare, times a case over the threshold is measured again"
+    )
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cases = [case for case in build_cases() if not args.filter or args.filter in case.name]
+
+    baseline: Optional[dict] = read_results(args.compare) if args.compare else None
+    results: dict[str, dict[str, float]] = {}
+
+    def over_threshold(case: Case) -> bool:
+        before = baseline["results"].get(case.name) if baseline else None
+        return before is not None and results[case.name]["median_ns_per_op"] > before["median_ns_per_op"] * (
+            1 + args.threshold
+        )
+
+    def run(case: Case, label: str) -> None:
+        result = measure(case, args.repeat)
+        print(label.ljust(36) + format(result["ns_per_op"], ">14.1f") + format(result["median_ns_per_op"], ">14.1f"))
+        if case.name in results:
+            result = min(results[case.name], result, key=lambda r: r["median_ns_per_op"])
+        results[case.name] = result
+
+    print("".ljust(36) + "".join(name.rjust(14) for name in ("ns/op", "median ns/op")))
+    for case in cases:
+        run(case, case.name)
+    # The machine has slow patches lasting seconds, a slower build is slow every time: measure
+    # the cases over the threshold again once the others are done, and keep the faster run.
+    for _ in range(args.retries):
+        for case in [case for case in cases if over_threshold(case)]:
+            run(case, f"{case.name} (again)")
+
+    write_results(args.output, "micro", results, {"repeat": args.repeat, "batch": BATCH})
+    print(f"results written to {args.output}")
+
+    if baseline:
+        print(f"\ncompared with {args.compare} (threshold {round(args.threshold * 100)}%)")
+        if compare(baseline, read_results(args.output), [("median_ns_per_op", True)], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Event-loop stall caused by bcrypt, with password work inline vs in the password thread pool.
+
+A probe coroutine sleeps for ``--tick-ms`` in a loop and records how late it wakes up,
+which is the extra latency any redirect handled by the same worker would see. Meanwhile
+``--concurrency`` clients keep authenticating for ``--duration`` seconds.
+
+    uv run python benchmarks/password_hashing_stall.py --rounds 12 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+# Settings require database credentials even though nothing here connects.
+for name, value in {
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+    "POSTGRES_DB": "benchmark",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=4, help="password thread pool size")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent authenticating clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--tick-ms", type=float, default=1.0, help="probe sleep interval")
+    return parser.parse_args()
+
+
+async def probe(stop: asyncio.Event, tick: float, lateness: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(tick)
+        lateness.append(time.perf_counter() - started - tick)
+
+
+async def run_scenario(verify, hashed_password: str, args: argparse.Namespace) -> dict:
+    stop = asyncio.Event()
+    lateness: list[float] = []
+    verified = 0
+
+    async def client() -> None:
+        nonlocal verified
+        while not stop.is_set():
+            await verify("correct horse", hashed_password)
+            verified += 1
+            # Yield between requests like a real handler would, or inline clients never give the loop back.
+            await asyncio.sleep(0)
+
+    probe_task = asyncio.create_task(probe(stop, args.tick_ms / 1000, lateness))
+    clients = [asyncio.create_task(client()) for _ in range(args.concurrency)]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(probe_task, *clients)
+
+    lateness.sort()
+    return {
+        "verifications/s": verified / args.duration,
+        "stall p50 ms": statistics.median(lateness) * 1000,
+        "stall p99 ms": lateness[int(len(lateness) * 0.99) - 1] * 1000,
+        "stall max ms": lateness[-1] * 1000,
+        "stalled ms total": sum(lateness) * 1000,
+    }
+
+
+async def main() -> None:
+    args = parse_args()
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASHING_MAX_WORKERS"] = str(args.workers)
+
+    from url_alias.domains.users import security
+
+    hashed_password = security.pwd_context.hash("correct horse")
+
+    async def verify_inline(plain_password: str, hashed_password: str) -> bool:
+        return security.pwd_context.verify(plain_password, hashed_password)
+
+    results = {
+        "inline": await run_scenario(verify_inline, hashed_password, args),
+        "thread pool": await run_scenario(security.verify_password, hashed_password, args),
+    }
+    security.shutdown_password_executor()
+
+    print(f"bcrypt rounds={args.rounds} workers={args.workers} concurrency={args.concurrency}")
+    metrics = list(next(iter(results.values())))
+    print("".ljust(18) + "".join(name.rjust(14) for name in results))
+    for metric in metrics:
+        print(metric.ljust(18) + "".join(format(result[metric], ">14.1f") for result in results.values()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,250 @@
+"""
+Query plan regression check for the hot read paths.
+
+Seeds a scratch schema in the configured database with a large, skewed dataset
+(one heavy user owning a big share of the aliases, many small users), runs the
+real repository methods and asserts on the EXPLAIN plans Postgres picks for the
+statements they emit: the expected index is used, the big tables are never read
+with a sequential scan and listings need no explicit sort.
+
+    make check-query-plans
+    uv run python benchmarks/query_plans.py --aliases 500000 --keep
+
+Exits with status 1 if any check fails. The scratch schema is dropped afterwards
+unless --keep is given, in which case it is reused by the next run.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+import url_alias.main  # noqa: E402,F401  registers every model with Base.metadata
+from url_alias.db.database import Base  # noqa: E402
+from url_alias.domains.aliases.repository import AliasRepository  # noqa: E402
+from url_alias.domains.aliases.utils import generate_short_code_from_id  # noqa: E402
+from url_alias.domains.statistics.repository import StatisticRepository  # noqa: E402
+from url_alias.shared.config import get_config  # noqa: E402
+
+config = get_config()
+
+BIG_TABLES = {"aliases", "alias_statistics", "alias_click_buckets", "alias_click_hourly_buckets"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--aliases", type=int, default=200_000, help="total aliases to seed")
+    parser.add_argument("--users", type=int, default=2_000, help="number of small users")
+    parser.add_argument("--heavy-share", type=float, default=0.25, help="share of aliases owned by the heavy user")
+    parser.add_argument("--schema", default="query_plan_check", help="scratch schema to seed")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded schema for the next run")
+    return parser.parse_args()
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    run: Callable[[AsyncSession], Awaitable[object]]
+    expected_indexes: set[str]
+    plans: list[dict] = field(default_factory=list)
+
+    def failures(self) -> list[str]:
+        nodes = [node for plan in self.plans for node in walk(plan["Plan"])]
+        problems = []
+        if not nodes:
+            problems.append("no statement was captured")
+        for node in nodes:
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in BIG_TABLES:
+                problems.append(f"sequential scan on {node['Relation Name']}")
+            if node["Node Type"] in ("Sort", "Incremental Sort"):
+                problems.append(f"explicit sort on {', '.join(node.get('Sort Key', []))}")
+        used = {node["Index Name"] for node in nodes if "Index Name" in node}
+        for index in sorted(self.expected_indexes - used):
+            problems.append(f"index {index} not used (used: {', '.join(sorted(used)) or 'none'})")
+        return problems
+
+
+def walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+class PlanRecorder:
+    """Runs EXPLAIN with the exact SQL and parameters of every SELECT the repositories execute."""
+
+    def __init__(self):
+        self.current: Optional[PlanCheck] = None
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.current is None or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        [(plan,)] = cursor.fetchall()
+        self.current.plans.append((json.loads(plan) if isinstance(plan, str) else plan)[0])
+
+
+async def seed(session: AsyncSession, args: argparse.Namespace) -> None:
+    heavy_aliases = int(args.aliases * args.heavy_share)
+    await session.execute(
+        text(
+            "INSERT INTO users (id, username, hashed_password, is_active) "
+            "SELECT g, 'user_' || g, 'x', true FROM generate_series(1, :users + 1) AS g"
+        ),
+        {"users": args.users},
+    )
+    # User 1 is the heavy account; the rest are spread over the small users. About 10% of
+    # the aliases are disabled and 10% expired, and creation times span the last year.
+    await session.execute(
+        text(
+            "INSERT INTO aliases (id, target_url, short_code, user_id, expires_at, is_enabled, created_at) "
+            "SELECT g, 'https://example.com/' || md5(g::text) || '/' || g, NULL, "
+            "CASE WHEN g <= :heavy THEN 1 ELSE 2 + g % :users END, "
+            "CASE WHEN g % 10 = 1 THEN now() - interval '1 day' ELSE now() + interval '30 days' END, "
+            "g % 10 <> 2, now() - (g % 525600) * interval '1 minute' "
+            "FROM generate_series(1, :aliases) AS g"
+        ),
+        {"heavy": heavy_aliases, "users": args.users, "aliases": args.aliases},
+    )
+    await session.execute(text("SELECT setval('aliases_id_seq', :aliases)"), {"aliases": args.aliases})
+    # Every alias has a statistics row; half of them have clicks.
+    await session.execute(
+        text(
+            "INSERT INTO alias_statistics (alias_id, user_id, total_clicks, last_clicked_at) "
+            "SELECT id, user_id, CASE WHEN id % 2 = 0 THEN (id * 7919) % 10000 ELSE 0 END, now() FROM aliases"
+        )
+    )
+    await session.execute(
+        text(
+            "INSERT INTO alias_click_buckets (alias_id, bucket_start, clicks) "
+            "SELECT a.id, date_trunc('minute', now()) - m * interval '1 minute', 1 "
+            "FROM aliases a CROSS JOIN generate_series(0, 1439, 60) AS m WHERE a.id % 20 = 0"
+        )
+    )
+
+
+async def fill_short_codes(session: AsyncSession, aliases: int) -> None:
+    """Short codes come from the app's encoder, so they are set from Python in chunks."""
+    chunk = 10_000
+    for start in range(1, aliases + 1, chunk):
+        ids = list(range(start, min(start + chunk, aliases + 1)))
+        await session.execute(
+            text(
+                "UPDATE aliases SET short_code = c.code "
+                "FROM unnest(CAST(:ids AS integer[]), CAST(:codes AS varchar[])) AS c(id, code) "
+                "WHERE aliases.id = c.id"
+            ),
+            {"ids": ids, "codes": [generate_short_code_from_id(alias_id) for alias_id in ids]},
+        )
+
+
+def build_checks(args: argparse.Namespace) -> list[PlanCheck]:
+    now = datetime.now(timezone.utc)
+    heavy_user, small_user = 1, 2
+    deep_cursor = (now - timedelta(days=200), 10**9)
+    resolve_id = args.aliases // 2
+
+    return [
+        PlanCheck(
+            "aliases: first page, heavy user",
+            lambda s: AliasRepository(s).get_user_aliases(user_id=heavy_user, limit=21),
+            {"ix_aliases_user_id_created_at"},
+        ),
+        PlanCheck(
+            "aliases: deep cursor page, heavy user",
+            lambda s: AliasRepository(s).get_user_aliases(user_id=heavy_user, limit=21, after=deep_cursor),
+            {"ix_aliases_user_id_created_at"},
+        ),
+        PlanCheck(
+            "aliases: active only, heavy user",
+            lambda s: AliasRepository(s).get_user_aliases(user_id=heavy_user, active_only=True, limit=21),
+            {"ix_aliases_enabled_user_id_created_at"},
+        ),
+        PlanCheck(
+            "aliases: first page, small user",
+            lambda s: AliasRepository(s).get_user_aliases(user_id=small_user, limit=21),
+            {"ix_aliases_user_id_created_at"},
+        ),
+        PlanCheck(
+            "aliases: resolve short code",
+            lambda s: AliasRepository(s).get_by_short_code(generate_short_code_from_id(resolve_id)),
+            {"aliases_pkey"},
+        ),
+        PlanCheck(
+            "statistics: top page, heavy user",
+            lambda s: StatisticRepository(s).get_statistics_summary(user_id=heavy_user, now=now, limit=21),
+            {"ix_alias_statistics_user_id_total_clicks", "aliases_pkey", "alias_click_buckets_pkey"},
+        ),
+        PlanCheck(
+            "statistics: ascending cursor page, heavy user",
+            lambda s: StatisticRepository(s).get_statistics_summary(
+                user_id=heavy_user, now=now, sort_order="asc", limit=21, after=(5_000, 0)
+            ),
+            {"ix_alias_statistics_user_id_total_clicks", "aliases_pkey", "alias_click_buckets_pkey"},
+        ),
+        PlanCheck(
+            "statistics: top page, small user",
+            lambda s: StatisticRepository(s).get_statistics_summary(user_id=small_user, now=now, limit=21),
+            {"ix_alias_statistics_user_id_total_clicks", "aliases_pkey", "alias_click_buckets_pkey"},
+        ),
+    ]
+
+
+async def main() -> int:
+    args = parse_args()
+    engine = create_async_engine(config.db.postgres_url, connect_args={"server_settings": {"search_path": args.schema}})
+    recorder = PlanRecorder()
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+
+    try:
+        async with engine.begin() as conn:
+            exists = await conn.scalar(
+                text("SELECT count(*) FROM information_schema.schemata WHERE schema_name = :schema"),
+                {"schema": args.schema},
+            )
+        if not exists:
+            print(f"Seeding {args.aliases} aliases into schema {args.schema}...")
+            async with engine.begin() as conn:
+                await conn.execute(text(f'CREATE SCHEMA "{args.schema}"'))
+                await conn.run_sync(Base.metadata.create_all)
+            async with AsyncSession(engine) as session:
+                await seed(session, args)
+                await fill_short_codes(session, args.aliases)
+                await session.commit()
+            async with engine.connect() as conn:
+                await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text("VACUUM ANALYZE"))
+
+        failed = 0
+        async with AsyncSession(engine) as session:
+            for check in build_checks(args):
+                recorder.current = check
+                await check.run(session)
+                recorder.current = None
+
+                problems = check.failures()
+                failed += bool(problems)
+                print(f"{'FAIL' if problems else 'ok  '} {check.name}")
+                for problem in problems:
+                    print(f"       {problem}")
+        return 1 if failed else 0
+
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f'DROP SCHEMA IF EXISTS "{args.schema}" CASCADE'))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,95 @@
+"""
+Cost of one rate limit check and memory held by the counters, per limiter storage.
+
+Runs slowapi's sliding window strategy over ``--checks`` hits from ``--clients`` distinct
+client addresses against limits' MemoryStorage and the shared memory-mapped table, and
+with ``--postgres`` against the rate_limit_counters table as well (needs the database).
+"Python heap" is what the storage allocated on the Python heap while the checks ran; the
+shared table's own memory is the fixed size of its file.
+
+    uv run python benchmarks/rate_limit_storage.py --clients 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+for name, value in {
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+    "POSTGRES_DB": "benchmark",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "LOG_LEVEL": "WARNING",
+    "METRICS_ENABLED": "false",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=200_000, help="rate limit checks per storage")
+    parser.add_argument("--clients", type=int, default=100_000, help="distinct client addresses, used in turn")
+    parser.add_argument("--slots", type=int, default=65_536, help="size of the shared table")
+    parser.add_argument("--postgres", action="store_true", help="also measure the Postgres storage")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    import url_alias.main  # noqa: F401  # isort: skip  imported first, it sets up the models in dependency order
+    from limits import parse
+    from limits.storage import MemoryStorage, storage_from_string
+    from limits.strategies import SlidingWindowCounterRateLimiter
+
+    from url_alias.shared.config import get_config
+    from url_alias.shared.rate_limit_storage import SLOT_SIZE
+
+    path = os.path.join(tempfile.gettempdir(), f"url-alias-benchmark-rate-limits-{os.getpid()}.bin")
+    storages = {
+        "memory": (MemoryStorage, None),
+        "shared": (lambda: storage_from_string("mmap://" + path, slots=args.slots), args.slots * SLOT_SIZE),
+    }
+    if args.postgres:
+        storages["postgres"] = (lambda: storage_from_string(get_config().db.asyncpg_dsn, timeout=5.0), None)
+
+    item = parse("30/minute")
+    clients = [f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}" for number in range(args.clients)]
+
+    print(f"checks={args.checks} clients={args.clients}")
+    print("".ljust(12) + "".join(name.rjust(16) for name in ("us per check", "Python heap MB", "file MB")))
+    for label, (make_storage, file_size) in storages.items():
+        storage = make_storage()
+        storage.reset()
+        limiter = SlidingWindowCounterRateLimiter(storage)
+
+        tracemalloc.start()
+        for number in range(min(args.checks, args.clients)):
+            limiter.hit(item, clients[number], "redirect")
+        heap, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        for number in range(args.checks):
+            limiter.hit(item, clients[number % args.clients], "redirect")
+        per_check = (time.perf_counter() - started) / args.checks * 1_000_000
+
+        file_mb = "-" if file_size is None else format(file_size / 1_000_000, ".1f")
+        print(label.ljust(12) + format(per_check, ">16.2f") + format(heap / 1_000_000, ">16.1f") + file_mb.rjust(16))
+        storage.reset()
+        if hasattr(storage, "close"):
+            storage.close()
+
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Redirect throughput per CPU core through the FastAPI route vs FastRedirectMiddleware.
+
+Each scenario imports the real application in a fresh process, with FAST_REDIRECT_ENABLED
+off or on, and calls it directly as an ASGI app for ``--requests`` redirects, so only the
+application's own CPU time is measured: no HTTP parsing, sockets or load generator. The
+aliases are preloaded into the resolution cache, so no database is needed, and each request
+comes from a different client address, so the rate limiter runs but never rejects.
+
+    uv run python benchmarks/redirect_fast_path.py --requests 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+# Settings require database credentials even though nothing here connects.
+for name, value in {
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+    "POSTGRES_DB": "benchmark",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "LOG_LEVEL": "WARNING",
+    "METRICS_DIR": os.path.join(tempfile.gettempdir(), f"url-alias-benchmark-metrics-{os.getpid()}"),
+}.items():
+    os.environ.setdefault(name, value)
+
+SCENARIOS = {"route": "false", "fast path": "true"}
+TARGET_URL = "https://example.com/articles/{}?utm_source=benchmark"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50_000, help="measured redirects per scenario")
+    parser.add_argument("--warmup", type=int, default=2_000, help="redirects before measuring")
+    parser.add_argument("--aliases", type=int, default=1_000, help="distinct short codes, all cached")
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+async def run_scenario(args: argparse.Namespace) -> dict:
+    from url_alias.main import app  # isort: skip  imported first, it sets up the models in dependency order
+    from url_alias.domains.aliases.cache import ResolvedAlias, alias_resolution_cache
+    from url_alias.domains.aliases.utils import generate_short_code_from_id
+
+    paths = []
+    for alias_id in range(1, args.aliases + 1):
+        short_code = generate_short_code_from_id(alias_id)
+        alias_resolution_cache.set(short_code, ResolvedAlias(alias_id, TARGET_URL.format(alias_id), True, None))
+        paths.append(f"/{short_code}")
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    statuses: dict[int, int] = {}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            statuses[message["status"]] = statuses.get(message["status"], 0) + 1
+
+    async def redirect(number: int) -> None:
+        path = paths[number % len(paths)]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"localhost:8000"), (b"user-agent", b"benchmark")],
+            # A new address every request keeps every client under the rate limit.
+            "client": (f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}", 40000),
+            "server": ("localhost", 8000),
+        }
+        await app(scope, receive, send)
+
+    for number in range(args.warmup):
+        await redirect(number)
+    statuses.clear()
+
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for number in range(args.warmup, args.warmup + args.requests):
+        await redirect(number)
+    cpu, wall = time.process_time() - cpu_started, time.perf_counter() - wall_started
+
+    return {"cpu_seconds": cpu, "wall_seconds": wall, "statuses": statuses}
+
+
+def main() -> None:
+    args = parse_args()
+    if args.scenario:
+        print(json.dumps(asyncio.run(run_scenario(args))))
+        return
+
+    results = {}
+    for scenario, enabled in SCENARIOS.items():
+        command = [sys.executable, __file__, "--scenario", scenario] + sys.argv[1:]
+        output = subprocess.run(
+            command, env={**os.environ, "FAST_REDIRECT_ENABLED": enabled}, capture_output=True, text=True, check=True
+        ).stdout
+        results[scenario] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"requests={args.requests} aliases={args.aliases}")
+    print("".ljust(24) + "".join(name.rjust(14) for name in results))
+    rows = {
+        "requests/s per core": lambda result: args.requests / result["cpu_seconds"],
+        "CPU us per request": lambda result: result["cpu_seconds"] / args.requests * 1_000_000,
+        "requests/s wall clock": lambda result: args.requests / result["wall_seconds"],
+    }
+    for label, value in rows.items():
+        print(label.ljust(24) + "".join(format(value(result), ">14.1f") for result in results.values()))
+    print("status codes".ljust(24) + "".join(str(result["statuses"]).rjust(14) for result in results.values()))
+
+
+if __name__ == "__main__":
+    main()
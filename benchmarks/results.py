@@ -0,0 +1,108 @@
+"""
+Result files of the benchmark suites: one JSON document per run, with the machine it ran on.
+
+    {"suite": "micro", "environment": {...}, "results": {"<case>": {"<metric>": value, ...}}}
+
+Runs are only comparable on the same hardware with the same parameters; compare() warns when
+either differs.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=RESULTS_DIR.parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def write_results(path: str, suite: str, results: dict[str, dict[str, Any]], parameters: dict[str, Any]) -> None:
+    document = {
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "parameters": parameters,
+        "results": results,
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def read_results(path: str) -> dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    metrics: Iterable[tuple[str, bool]],
+    threshold: float,
+) -> bool:
+    """
+    Print each case's metrics next to the baseline's and return whether any got worse by
+    more than ``threshold`` (0.1 is 10%). ``metrics`` are (name, lower_is_better) pairs.
+    """
+    metrics = list(metrics)
+    for key in ("python", "platform", "machine"):
+        if baseline["environment"].get(key) != current["environment"].get(key):
+            print(
+                f"warning: baseline {key} {baseline['environment'].get(key)!r} "
+                f"differs from {current['environment'].get(key)!r}, results may not be comparable",
+                file=sys.stderr,
+            )
+    for key in sorted(set(baseline["parameters"]) | set(current["parameters"])):
+        if baseline["parameters"].get(key) != current["parameters"].get(key):
+            print(
+                f"warning: baseline {key}={baseline['parameters'].get(key)!r} "
+                f"differs from {current['parameters'].get(key)!r}",
+                file=sys.stderr,
+            )
+
+    regressed = False
+    print("".ljust(36) + "".join(name.rjust(14) for name in ("baseline", "current", "change")))
+    for case in sorted(set(baseline["results"]) | set(current["results"])):
+        before: Optional[dict] = baseline["results"].get(case)
+        after: Optional[dict] = current["results"].get(case)
+        if before is None or after is None:
+            print(case.ljust(36) + ("new" if before is None else "removed").rjust(42))
+            continue
+        for metric, lower_is_better in metrics:
+            if metric not in before or metric not in after or not before[metric]:
+                continue
+            change = after[metric] / before[metric] - 1
+            worse = change > threshold if lower_is_better else change < -threshold
+            improved = change < -threshold if lower_is_better else change > threshold
+            regressed = regressed or worse
+            label = f"{case} {metric}" if len(metrics) > 1 else case
+            print(
+                label.ljust(36)
+                + format(before[metric], ">14.1f")
+                + format(after[metric], ">14.1f")
+                + format(change * 100, ">+13.1f")
+                + "%"
+                + ("  REGRESSION" if worse else "  improved" if improved else "")
+            )
+    return regressed
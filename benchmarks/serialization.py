@@ -0,0 +1,168 @@
+"""
+Cost of serializing one page of the alias and statistics listings, per page and per row.
+
+"schemas" is the previous path: a pydantic model per row, which FastAPI dumps, validates
+again against ``response_model`` and serializes before JSONResponse encodes it (the steps
+of ``fastapi.routing.serialize_response``). "rows" is the current one: plain dicts encoded
+by RowsJSONResponse. Both must produce the same bytes, which is checked before timing.
+
+    uv run python benchmarks/serialization.py --rows 100
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+# Settings require database credentials even though nothing here connects.
+for name, value in {
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+    "POSTGRES_DB": "benchmark",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "LOG_LEVEL": "WARNING",
+    "METRICS_ENABLED": "false",
+}.items():
+    os.environ.setdefault(name, value)
+
+BASE_URL = "http://localhost:8000"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs; the best one is reported")
+    return parser.parse_args()
+
+
+def alias_rows(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=alias_id,
+            created_at=now - timedelta(minutes=alias_id),
+            updated_at=now - timedelta(minutes=alias_id),
+            target_url=f"{BASE_URL}/articles/{alias_id}?utm_source=newsletter&utm_medium=email",
+            short_code="a" + str(alias_id).zfill(10),
+            user_id=1,
+            expires_at=now + timedelta(days=1 if alias_id % 3 else -1),
+            is_enabled=alias_id % 5 != 0,
+        )
+        for alias_id in range(1, count + 1)
+    ]
+
+
+def statistic_rows(count: int) -> list:
+    return [
+        SimpleNamespace(
+            short_code="a" + str(alias_id).zfill(10),
+            target_url=f"{BASE_URL}/articles/{alias_id}?utm_source=newsletter&utm_medium=email",
+            last_hour_clicks=alias_id * 3,
+            last_day_clicks=alias_id * 40,
+            total_clicks=alias_id * 1000,
+        )
+        for alias_id in range(count, 0, -1)
+    ]
+
+
+def main() -> None:
+    args = parse_args()
+
+    import url_alias.main  # noqa: F401  # isort: skip  imported first, it sets up the models in dependency order
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+
+    from url_alias.domains.aliases.routers import alias_read_row
+    from url_alias.domains.aliases.schemas import AliasRead
+    from url_alias.domains.statistics.schemas import StatisticSummary
+    from url_alias.shared.responses import RowsJSONResponse
+
+    def through_response_model(items: list, response_model: TypeAdapter) -> bytes:
+        content = [item.model_dump(by_alias=True) for item in items]
+        value = response_model.validate_python(content, from_attributes=True)
+        return JSONResponse(response_model.dump_python(value, mode="json", by_alias=True)).body
+
+    alias_list = TypeAdapter(List[AliasRead])
+    statistic_list = TypeAdapter(List[StatisticSummary])
+    aliases, statistics = alias_rows(args.rows), statistic_rows(args.rows)
+
+    def aliases_with_schemas() -> bytes:
+        items = [
+            AliasRead(
+                target_url=alias.target_url,
+                short_url=f"{BASE_URL}/{alias.short_code}",
+                user_id=alias.user_id,
+                expires_at=alias.expires_at,
+                is_enabled=alias.is_enabled,
+                id=alias.id,
+                created_at=alias.created_at,
+                updated_at=alias.updated_at,
+            )
+            for alias in aliases
+        ]
+        return through_response_model(items, alias_list)
+
+    def aliases_as_rows() -> bytes:
+        now = datetime.now(timezone.utc)
+        return RowsJSONResponse([alias_read_row(alias, BASE_URL, now) for alias in aliases]).body
+
+    def statistics_with_schemas() -> bytes:
+        items = [
+            StatisticSummary(
+                short_url=f"{BASE_URL}/{row.short_code}",
+                target_url=row.target_url,
+                last_hour_clicks=row.last_hour_clicks,
+                last_day_clicks=row.last_day_clicks,
+                total_clicks=row.total_clicks,
+            )
+            for row in statistics
+        ]
+        return through_response_model(items, statistic_list)
+
+    def statistics_as_rows() -> bytes:
+        rows = [
+            {
+                "short_url": f"{BASE_URL}/{row.short_code}",
+                "target_url": row.target_url,
+                "last_hour_clicks": row.last_hour_clicks,
+                "last_day_clicks": row.last_day_clicks,
+                "total_clicks": row.total_clicks,
+            }
+            for row in statistics
+        ]
+        return RowsJSONResponse(rows).body
+
+    cases = {
+        "aliases": (aliases_with_schemas, aliases_as_rows),
+        "statistics": (statistics_with_schemas, statistics_as_rows),
+    }
+
+    print(f"rows per page={args.rows}")
+    print("".ljust(12) + "".join(name.rjust(16) for name in ("schemas us/page", "rows us/page", "speedup")))
+    for label, (with_schemas, as_rows) in cases.items():
+        if with_schemas() != as_rows():
+            raise SystemExit(f"{label}: the two paths produce different JSON")
+
+        timings = []
+        for func in (with_schemas, as_rows):
+            number, _ = timeit.Timer(func).autorange()
+            timings.append(min(timeit.repeat(func, number=number, repeat=args.repeat)) / number * 1_000_000)
+        print(
+            label.ljust(12)
+            + format(timings[0], ">16.1f")
+            + format(timings[1], ">16.1f")
+            + format(timings[0] / timings[1], ">15.1f")
+            + "x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import ipaddress
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from url_alias.db.database import engine, pool_metrics, replica_engine, replica_pool_metrics
+from url_alias.shared.config import get_config
+from url_alias.shared.prometheus import CONTENT_TYPE, metrics_registry
+
+config = get_config()
+
+allowed_networks = [ipaddress.ip_network(network) for network in config.internal_api.INTERNAL_API_ALLOWED_NETWORKS]
+
+
+def require_internal_client(request: Request) -> None:
+    """Hide internal endpoints from clients outside INTERNAL_API_ALLOWED_NETWORKS."""
+    try:
+        address = ipaddress.ip_address(request.client.host) if request.client else None
+    except ValueError:
+        address = None
+    if address is None or not any(address in network for network in allowed_networks):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+router = APIRouter(prefix="/internal", include_in_schema=False, dependencies=[Depends(require_internal_client)])
+
+
+@router.get("/pool")
+async def get_pool_status():
+    """Connection pool state of this worker process, with wait and connect latency histograms."""
+    return {
+        "primary": pool_metrics.snapshot(engine),
+        "replica": replica_pool_metrics.snapshot(replica_engine) if replica_engine is not None else None,
+    }
+
+
+metrics_router = APIRouter(include_in_schema=False, dependencies=[Depends(require_internal_client)])
+
+
+@metrics_router.get("/metrics")
+async def get_metrics():
+    """Metrics of all worker processes in Prometheus text format."""
+    return PlainTextResponse(metrics_registry.collect(), media_type=CONTENT_TYPE)
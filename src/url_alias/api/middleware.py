@@ -0,0 +1,76 @@
+import time
+from typing import Any, Callable, Optional
+
+from starlette.routing import replace_params
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from url_alias.shared.prometheus import Counter, Histogram
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_request_duration = Histogram(
+    "url_alias_http_request_duration_seconds",
+    "Time from receiving a request until its response was sent, by route template.",
+    ["method", "route"],
+)
+http_responses = Counter(
+    "url_alias_http_responses",
+    "Responses sent, by route template and status code.",
+    ["method", "route", "status"],
+)
+
+
+class MetricsMiddleware:
+    """
+    Records latency and status codes of HTTP requests, labeled by route template
+    (``/{short_code}``, not the path itself) to keep the number of series bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_paths: Optional[dict[Callable, str]] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method, route = scope["method"], self._route_template(scope)
+            http_request_duration.labels(method, route).observe(time.perf_counter() - started)
+            http_responses.labels(method, route, status_code).inc()
+
+    def _route_template(self, scope: Scope) -> str:
+        route = scope.get("route")
+        if route is not None and hasattr(route, "param_convertors"):
+            return self._full_route_path(scope, route)
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._route_paths is None:
+            self._route_paths = self._collect_route_paths(scope["app"])
+        return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
+
+    @staticmethod
+    def _full_route_path(scope: Scope, route: Any) -> str:
+        # The route's path may be relative to the router it was included with. Whatever precedes
+        # its concrete form in the request path is that router's prefix.
+        concrete, _ = replace_params(route.path_format, route.param_convertors, dict(scope.get("path_params", {})))
+        prefix_length = len(scope["path"]) - len(concrete)
+        return scope["path"][:prefix_length] + route.path
+
+    @staticmethod
+    def _collect_route_paths(app: Any) -> dict[Callable, str]:
+        # Older Starlette versions only put the matched endpoint into the scope, so map endpoints back to paths.
+        return {route.endpoint: route.path for route in app.routes if hasattr(route, "endpoint")}
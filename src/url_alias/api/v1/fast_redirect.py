@@ -0,0 +1,114 @@
+import json
+from urllib.parse import quote
+
+from fastapi import status
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from starlette.requests import Request
+from starlette.routing import get_route_path
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from url_alias.api.v1.public import (
+    NO_CACHE_HEADERS,
+    NOT_FOUND_DETAIL,
+    REDIRECT_ERROR_DETAIL,
+    logger,
+    redirect_to_url,
+    resolve_redirect,
+)
+from url_alias.api.v1.public import router as public_router
+from url_alias.db.database import async_session_factory, read_session_factory
+from url_alias.domains.aliases.services import AliasService
+from url_alias.domains.aliases.utils import short_code_to_alias_id
+from url_alias.domains.statistics.services import StatisticService
+from url_alias.shared.rate_limiting import check_rate_limit
+
+# The same characters RedirectResponse leaves unescaped in the Location header.
+LOCATION_SAFE_CHARACTERS = ":/%#?=@[]!$&'()*+,;"
+
+REDIRECT_HEADERS = [(b"content-length", b"0")] + [
+    (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in NO_CACHE_HEADERS.items()
+]
+
+
+def _json_response(status_code: int, detail: str) -> tuple[dict, dict]:
+    body = json.dumps({"detail": detail}, separators=(",", ":")).encode()
+    headers = [(b"content-length", str(len(body)).encode()), (b"content-type", b"application/json")]
+    start = {"type": "http.response.start", "status": status_code, "headers": headers}
+    return start, {"type": "http.response.body", "body": body}
+
+
+NOT_FOUND_RESPONSE = _json_response(status.HTTP_404_NOT_FOUND, NOT_FOUND_DETAIL)
+ERROR_RESPONSE = _json_response(status.HTTP_500_INTERNAL_SERVER_ERROR, REDIRECT_ERROR_DETAIL)
+EMPTY_BODY = {"type": "http.response.body", "body": b""}
+
+
+class FastRedirectMiddleware:
+    """
+    Serves ``GET /{short_code}`` without FastAPI routing, dependency injection or response classes.
+
+    Only paths of a single segment that decodes to an alias id are taken; everything
+    else, malformed codes included, goes on to the FastAPI app. The redirect goes
+    through resolve_redirect and the same rate limit as the regular route, and gets
+    the same status codes, headers and error bodies.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Reported to the metrics middleware, so redirects are counted under the route's template.
+        self.route = next(route for route in public_router.routes if route.name == redirect_to_url.__name__)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        short_code = get_route_path(scope)[1:]
+        if "/" in short_code or short_code_to_alias_id(short_code) is None:
+            await self.app(scope, receive, send)
+            return
+
+        scope["route"] = self.route
+        scope["endpoint"] = redirect_to_url
+        scope["path_params"] = {"short_code": short_code}
+
+        request = Request(scope)
+        try:
+            await check_rate_limit(request)
+        except RateLimitExceeded as e:
+            await _rate_limit_exceeded_handler(request, e)(scope, receive, send)
+            return
+
+        session, read_session = async_session_factory(), read_session_factory()
+        try:
+            alias = await resolve_redirect(
+                short_code,
+                AliasService(session=session, read_session=read_session),
+                StatisticService(session=session, read_session=read_session),
+            )
+        except Exception as e:
+            logger.error("Error processing redirect for %s: %s", short_code, e)
+            await self._send(send, *ERROR_RESPONSE)
+            return
+        finally:
+            # Cache hits never touch either session. Closing one that holds no connection only
+            # costs a task switch, and a read session has already closed itself after each query.
+            if session.in_transaction():
+                await session.close()
+
+        if alias is None:
+            await self._send(send, *NOT_FOUND_RESPONSE)
+            return
+
+        location = quote(alias.target_url, safe=LOCATION_SAFE_CHARACTERS).encode("latin-1")
+        start = {
+            "type": "http.response.start",
+            "status": status.HTTP_302_FOUND,
+            "headers": [(b"location", location), *REDIRECT_HEADERS],
+        }
+        await self._send(send, start, EMPTY_BODY)
+
+    @staticmethod
+    async def _send(send: Send, start: dict, body: dict) -> None:
+        await send(start)
+        await send(body)
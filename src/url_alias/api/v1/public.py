@@ -1,19 +1,48 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import RedirectResponse
 
+from url_alias.domains.aliases.cache import ResolvedAlias
 from url_alias.domains.aliases.dependencies import get_alias_service
 from url_alias.domains.aliases.services import AliasService
 from url_alias.domains.statistics.dependencies import get_statistic_service
 from url_alias.domains.statistics.services import StatisticService
 from url_alias.shared.logging import get_logger
-from url_alias.shared.rate_limiting import limiter
+from url_alias.shared.rate_limiting import REDIRECT_RATE_LIMIT, check_rate_limit, limiter
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Prevent the browser from caching the redirect
+NO_CACHE_HEADERS = {"Cache-Control": "no-cache, no-store, must-revalidate", "Pragma": "no-cache", "Expires": "0"}
+NOT_FOUND_DETAIL = "Short URL not found or expired"
+REDIRECT_ERROR_DETAIL = "An unexpected error occurred while processing the redirect."
+
+
+async def resolve_redirect(
+    short_code: str, alias_service: AliasService, statistic_service: StatisticService
+) -> Optional[ResolvedAlias]:
+    """Find the active alias for a short code and record the click. Returns None if there is none."""
+    logger.info("Redirect request for short code: %s", short_code)
+
+    alias = await alias_service.get_active_alias_by_short_code(short_code)
+    if not alias:
+        logger.warning("Short code %s not found or expired", short_code)
+        return None
+
+    try:
+        await statistic_service.record_click(alias.id)
+        logger.debug("Recorded click for alias %s", alias.id)
+    except Exception as e:
+        logger.error("Failed to record click for alias %s: %s", alias.id, e)
 
-@router.get("/{short_code}")
-@limiter.limit("30/minute")
+    logger.info("Redirecting %s to: %s", short_code, alias.target_url)
+    return alias
+
+
+@router.get("/{short_code}", dependencies=[Depends(check_rate_limit)])
+@limiter.limit(REDIRECT_RATE_LIMIT)
 async def redirect_to_url(
     request: Request,
     short_code: str,
@@ -24,35 +53,15 @@ async def redirect_to_url(
     Redirect to the original URL using the short code. Public endpoint.
     Rate limited to 30 requests per minute per IP.
     """
-    logger.info(f"Redirect request for short code: {short_code}")
-
     try:
-        alias = await alias_service.get_active_alias_by_short_code(short_code)
+        alias = await resolve_redirect(short_code, alias_service, statistic_service)
         if not alias:
-            logger.warning(f"Short code {short_code} not found or expired")
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Short URL not found or expired")
-
-        try:
-            await statistic_service.record_click(alias.id)
-            logger.debug(f"Recorded click for alias {alias.id}")
-        except Exception as e:
-            logger.error(f"Failed to record click for alias {alias.id}: {str(e)}")
-
-        logger.info(f"Redirecting {short_code} to: {alias.target_url}")
-
-        response = RedirectResponse(url=alias.target_url, status_code=status.HTTP_302_FOUND)
-        # Prevent the browser from caching the redirect
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND_DETAIL)
 
-        return response
+        return RedirectResponse(url=alias.target_url, status_code=status.HTTP_302_FOUND, headers=NO_CACHE_HEADERS)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing redirect for {short_code}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while processing the redirect.",
-        )
+        logger.error("Error processing redirect for %s: %s", short_code, e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=REDIRECT_ERROR_DETAIL)
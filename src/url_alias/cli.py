@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Optional, Sequence
+
+import asyncpg
+from sqlalchemy.exc import SQLAlchemyError
+
+from url_alias.domains.aliases.importer import AliasImporter, ImportFormat
+from url_alias.domains.aliases.reaper import ExpiredAliasReaper
+from url_alias.shared.config import get_config
+from url_alias.shared.logging import get_logger
+
+config = get_config()
+logger = get_logger(__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="url-alias", description="URL Alias Service maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import",
+        help="bulk load aliases from CSV or NDJSON",
+        description=(
+            "Load aliases from a CSV file with a header row or from NDJSON. Columns: target_url (required), "
+            "expires_at (ISO 8601 with timezone), user_id, is_enabled. Running the same command again after "
+            "an interruption resumes after the last committed chunk."
+        ),
+    )
+    import_parser.add_argument("path", type=Path, help="input file")
+    import_parser.add_argument(
+        "--format", choices=[choice.value for choice in ImportFormat], help="input format (default: from extension)"
+    )
+    import_parser.add_argument("--user-id", type=int, help="owner of rows without a user_id")
+    import_parser.add_argument("--chunk-size", type=int, default=10_000, help="rows per COPY transaction")
+    import_parser.add_argument("--checkpoint", type=Path, help="progress file (default: <path>.checkpoint)")
+    import_parser.add_argument("--rejects", type=Path, help="append rejected rows and reasons to this file")
+    import_parser.set_defaults(handler=run_import)
+
+    reap_parser = commands.add_parser(
+        "reap",
+        help="archive expired aliases",
+        description="Move aliases that expired more than the grace period ago, and their statistics, to the archive.",
+    )
+    reap_parser.add_argument(
+        "--grace-period-hours", type=float, default=config.reaper.ALIAS_REAPER_GRACE_PERIOD_HOURS, help="hours"
+    )
+    reap_parser.add_argument(
+        "--batch-size", type=int, default=config.reaper.ALIAS_REAPER_BATCH_SIZE, help="aliases per transaction"
+    )
+    reap_parser.add_argument(
+        "--batch-pause", type=float, default=config.reaper.ALIAS_REAPER_BATCH_PAUSE_SECONDS, help="seconds"
+    )
+    reap_parser.add_argument("--max-batches", type=int, help="stop after this many batches (default: until done)")
+    reap_parser.set_defaults(handler=run_reap)
+
+    return parser
+
+
+async def run_import(args: argparse.Namespace) -> int:
+    importer = AliasImporter(chunk_size=args.chunk_size, default_user_id=args.user_id)
+    with open(args.rejects, "a") if args.rejects else nullcontext() as rejects:
+        input_format = ImportFormat(args.format) if args.format else None
+        report = await importer.run(args.path, input_format, args.checkpoint, rejects)
+
+    logger.info(
+        f"Import finished: {report.imported} imported, {report.rejected} rejected, "
+        f"{report.skipped} skipped from a previous run, "
+        f"{round(report.seconds, 1)}s ({round(report.rows_per_second)} rows/s)"
+    )
+    return 0
+
+
+async def run_reap(args: argparse.Namespace) -> int:
+    reaper = ExpiredAliasReaper(
+        enabled=True,
+        grace_period_hours=args.grace_period_hours,
+        batch_size=args.batch_size,
+        batch_pause_seconds=args.batch_pause,
+        interval_seconds=config.reaper.ALIAS_REAPER_INTERVAL_SECONDS,
+    )
+    await reaper.run_once(max_batches=args.max_batches)
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return asyncio.run(args.handler(args))
+    except (OSError, ValueError, RuntimeError, asyncpg.PostgresError, asyncpg.InterfaceError, SQLAlchemyError) as e:
+        logger.error(f"{args.command} failed: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,12 @@
 import logging
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Result
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from url_alias.db.instrumentation import instrument_queries
+from url_alias.db.pool import InstrumentedPool, PoolMetrics
 from url_alias.shared.config import get_config
 
 config = get_config()
@@ -12,20 +14,81 @@ config = get_config()
 logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
 logging.getLogger("sqlalchemy.pool").setLevel(logging.ERROR)
 
-engine = create_async_engine(
-    config.db.postgres_url,
-    echo=False,
-    poolclass=AsyncAdaptedQueuePool,
-)
 
+def build_engine(url: str, connect_args: dict[str, Any]) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedPool,
+        pool_size=config.db.DB_POOL_SIZE,
+        max_overflow=config.db.DB_MAX_OVERFLOW,
+        pool_timeout=config.db.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=config.db.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=config.db.DB_POOL_PRE_PING,
+        pool_use_lifo=config.db.DB_POOL_USE_LIFO,
+        connect_args=connect_args,
+    )
+    instrument_queries(engine)
+    return engine
 
-async_session_factory = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+
+class ReadSession(AsyncSession):
+    """
+    Session for the read-only work of a request, on an AUTOCOMMIT connection.
+
+    No BEGIN, COMMIT or ROLLBACK is ever sent, and the connection goes back to the pool
+    as soon as each statement's result has been buffered, so nothing is held while the
+    handler awaits something else (bcrypt, other services, the client). Loaded objects
+    are detached at that point, with their attributes loaded. Server-side cursors need a
+    transaction, so ``stream`` is not available; use a regular session for that.
+    """
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Result[Any]:
+        try:
+            return await super().execute(*args, **kwargs)
+        finally:
+            await self.close()
+
+
+def build_session_factory(
+    bind: AsyncEngine, class_: type[AsyncSession] = AsyncSession, **kwargs: Any
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind,
+        class_=class_,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+        **kwargs,
+    )
+
+
+def build_read_session_factory(bind: AsyncEngine, **kwargs: Any) -> async_sessionmaker[ReadSession]:
+    return build_session_factory(bind.execution_options(isolation_level="AUTOCOMMIT"), class_=ReadSession, **kwargs)
+
+
+engine = build_engine(config.db.postgres_url, config.db.connect_args)
+pool_metrics = PoolMetrics("primary")
+pool_metrics.attach(engine)
+
+async_session_factory = build_session_factory(engine)
+primary_read_session_factory = build_read_session_factory(engine)
+
+# Optional read replica. Without one, reads go through the primary like everything else.
+replica_engine: Optional[AsyncEngine] = None
+replica_pool_metrics: Optional[PoolMetrics] = None
+replica_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+replica_read_session_factory: Optional[async_sessionmaker[ReadSession]] = None
+if config.db.replica_postgres_url:
+    replica_engine = build_engine(config.db.replica_postgres_url, config.db.replica_connect_args)
+    replica_pool_metrics = PoolMetrics("replica")
+    replica_pool_metrics.attach(replica_engine)
+    replica_session_factory = build_session_factory(replica_engine)
+    replica_read_session_factory = build_read_session_factory(replica_engine, info={"replica": True})
+
+read_session_factory = replica_read_session_factory or primary_read_session_factory
+# Long reads through server-side cursors, which need a transaction.
+streaming_session_factory = replica_session_factory or async_session_factory
 
 
 class Base(DeclarativeBase):
@@ -35,12 +98,32 @@ class Base(DeclarativeBase):
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for the writes of a request, committed when the request succeeds.
+
+    The connection is only checked out by the first statement, and a session that was
+    never used ends without sending COMMIT.
+    """
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
+            if session.in_transaction():
+                await session.commit()
         except Exception:
-            await session.rollback()
+            if session.in_transaction():
+                await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def get_read_session() -> AsyncGenerator[ReadSession, None]:
+    """Session for read-only queries that tolerate replication lag: the replica if there is one."""
+    async with read_session_factory() as session:
+        yield session
+
+
+async def get_primary_read_session() -> AsyncGenerator[ReadSession, None]:
+    """Session for read-only queries that must see the latest committed data."""
+    async with primary_read_session_factory() as session:
+        yield session
@@ -0,0 +1,86 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from url_alias.shared.prometheus import Histogram
+
+_QUERY_STARTED = "url_alias_query_started"
+
+# Name of the repository method whose statements are running, used as the query metrics label.
+current_operation: ContextVar[str] = ContextVar("current_operation", default="other")
+
+db_query_duration = Histogram(
+    "url_alias_db_query_duration_seconds",
+    "Time spent executing database statements, by the repository method that issued them.",
+    ["operation"],
+)
+
+
+def track_operation(name: str) -> Callable:
+    """Label the statements run by an async function or async generator with ``name``."""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def generator_wrapper(*args, **kwargs):
+                # The label is only set while the generator runs, not while the caller handles its items.
+                iterator = func(*args, **kwargs)
+                try:
+                    while True:
+                        token = current_operation.set(name)
+                        try:
+                            item = await iterator.__anext__()
+                        except StopAsyncIteration:
+                            return
+                        finally:
+                            current_operation.reset(token)
+                        yield item
+                finally:
+                    await iterator.aclose()
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = current_operation.set(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                current_operation.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the statement's execution context, which is discarded with it whether it succeeds or fails.
+    setattr(context, _QUERY_STARTED, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _observe(context)
+
+
+def _handle_error(exception_context) -> None:
+    # Failed statements count too; a statement timeout is exactly the slow query worth seeing.
+    _observe(exception_context.execution_context)
+
+
+def _observe(context) -> None:
+    started = getattr(context, _QUERY_STARTED, None)
+    if started is not None:
+        delattr(context, _QUERY_STARTED)
+        db_query_duration.labels(current_operation.get()).observe(time.perf_counter() - started)
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
@@ -8,6 +8,7 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from url_alias.db.database import Base
+from url_alias.db.rate_limit import RateLimitCounter
 from url_alias.domains.aliases.models import Alias
 from url_alias.domains.statistics.models import AliasStatistic
 from url_alias.domains.users.models import User
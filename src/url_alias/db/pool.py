@@ -0,0 +1,116 @@
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from url_alias.shared.prometheus import Counter, Histogram
+
+_CONNECT_STARTED = "url_alias_connect_started"
+_CHECKED_OUT_AT = "url_alias_checked_out_at"
+_EVENTS = ("connects", "connect_errors", "checkouts", "checkins", "invalidations", "timeouts")
+
+pool_events = Counter(
+    "url_alias_db_pool_events",
+    "Connection pool events (connects, connect_errors, checkouts, checkins, invalidations, timeouts), by pool.",
+    ["pool", "event"],
+)
+pool_connect_latency = Histogram(
+    "url_alias_db_pool_connect_seconds", "Time to open a new database connection, by pool.", ["pool"]
+)
+pool_checkout_wait = Histogram(
+    "url_alias_db_pool_checkout_wait_seconds", "Time callers waited for a pooled connection, by pool.", ["pool"]
+)
+pool_hold_time = Histogram(
+    "url_alias_db_pool_hold_seconds", "Time a connection was checked out before being returned, by pool.", ["pool"]
+)
+
+
+class PoolMetrics:
+    """
+    Counters and latency histograms of one engine's connection pool, labeled with its name.
+
+    Connects, checkouts, hold times and invalidations come from SQLAlchemy pool and
+    dialect events. The time a caller waits for a connection has no event pair around
+    it, so InstrumentedPool reports it together with checkout timeouts and failed connects.
+    """
+
+    def __init__(self, name: str):
+        self.events = {event: pool_events.labels(name, event) for event in _EVENTS}
+        self.connect_latency = pool_connect_latency.labels(name)
+        self.checkout_wait = pool_checkout_wait.labels(name)
+        self.hold_time = pool_hold_time.labels(name)
+
+    def attach(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "do_connect", self._on_do_connect)
+        event.listen(sync_engine.pool, "connect", self._on_connect)
+        event.listen(sync_engine.pool, "checkout", self._on_checkout)
+        event.listen(sync_engine.pool, "checkin", self._on_checkin)
+        event.listen(sync_engine.pool, "invalidate", self._on_invalidate)
+        event.listen(sync_engine.pool, "soft_invalidate", self._on_invalidate)
+        sync_engine.pool._metrics = self
+
+    def _on_do_connect(self, dialect, connection_record, cargs, cparams) -> None:
+        connection_record.info[_CONNECT_STARTED] = time.perf_counter()
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.events["connects"].inc()
+        started = connection_record.info.pop(_CONNECT_STARTED, None)
+        if started is not None:
+            self.connect_latency.observe(time.perf_counter() - started)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.events["checkouts"].inc()
+        connection_record.info[_CHECKED_OUT_AT] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self.events["checkins"].inc()
+        checked_out_at = connection_record.info.pop(_CHECKED_OUT_AT, None)
+        if checked_out_at is not None:
+            self.hold_time.observe(time.perf_counter() - checked_out_at)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.events["invalidations"].inc()
+
+    def snapshot(self, engine: AsyncEngine) -> dict[str, Any]:
+        """The pool's state and this process's counts and latencies, which /metrics sums over all workers."""
+        pool = engine.sync_engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+            **{event: int(counter.value()) for event, counter in self.events.items()},
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "connect_latency_seconds": self.connect_latency.snapshot(),
+            "hold_time_seconds": self.hold_time.snapshot(),
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long callers wait for a connection and counts failures."""
+
+    _metrics: PoolMetrics
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self._metrics.events["timeouts"].inc()
+            raise
+        except Exception:
+            # Apart from timeouts, getting a connection only fails when opening a new one does.
+            self._metrics.events["connect_errors"].inc()
+            raise
+        finally:
+            self._metrics.checkout_wait.observe(time.perf_counter() - started)
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool._metrics = self._metrics
+        return pool
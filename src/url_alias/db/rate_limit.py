@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from url_alias.db.database import Base
+
+
+class RateLimitCounter(Base):
+    """
+    Sliding window rate limit counters of PostgresStorage, one row per limit and client.
+
+    UNLOGGED: counters are not worth WAL traffic, and losing them on a crash only resets limits.
+    The storage queries the table with asyncpg directly; the model is here for migrations.
+    """
+
+    __tablename__ = "rate_limit_counters"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    window_index: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    previous_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    current_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_hit_allowed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,9 +1,11 @@
+import inspect
 from typing import Generic, List, Optional, Type, TypeVar
 
 from pydantic import BaseModel as PydanticBaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from url_alias.db.instrumentation import track_operation
 from url_alias.db.model import BaseModel as SQLAlchemyBaseModel
 
 ModelType = TypeVar("ModelType", bound=SQLAlchemyBaseModel)
@@ -14,6 +16,15 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=PydanticBaseModel)
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base class for repository with CRUD operations"""
 
+    def __init_subclass__(cls, **kwargs):
+        """Label the queries of every public method, inherited ones included, as ``Repository.method``."""
+        super().__init_subclass__(**kwargs)
+        for name, method in inspect.getmembers(cls, inspect.isfunction):
+            if name.startswith("_"):
+                continue
+            if inspect.iscoroutinefunction(method) or inspect.isasyncgenfunction(method):
+                setattr(cls, name, track_operation(f"{cls.__name__}.{name}")(method))
+
     def __init__(self, model: Type[ModelType], session: AsyncSession):
         self.model = model
         self.session = session
@@ -0,0 +1,45 @@
+import asyncio
+from collections import deque
+
+from sqlalchemy import Sequence, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from url_alias.db.instrumentation import track_operation
+from url_alias.domains.aliases.constants import ALIAS_ID_SEQUENCE
+from url_alias.shared.config import get_config
+
+config = get_config()
+
+
+class AliasIdAllocator:
+    """
+    Hands out alias ids from blocks reserved on the ``aliases`` id sequence.
+
+    A block is reserved with a single ``SELECT nextval(...) FROM generate_series(1, n)``.
+    nextval is atomic and never rolled back, so blocks reserved by different workers
+    or nodes never overlap. Ids left unused when a process exits are skipped, which only
+    leaves gaps in the id space.
+    """
+
+    def __init__(self, block_size: int, sequence_name: str = ALIAS_ID_SEQUENCE):
+        self.block_size = block_size
+        self.sequence = Sequence(sequence_name)
+        self._ids: deque[int] = deque()
+        self._lock = asyncio.Lock()
+
+    async def allocate(self, session: AsyncSession, count: int = 1) -> list[int]:
+        """Return ``count`` unused ids, reserving a new block from the sequence when needed."""
+        async with self._lock:
+            missing = count - len(self._ids)
+            if missing > 0:
+                self._ids.extend(await self._reserve(session, max(missing, self.block_size)))
+            return [self._ids.popleft() for _ in range(count)]
+
+    @track_operation("AliasIdAllocator.reserve")
+    async def _reserve(self, session: AsyncSession, size: int) -> list[int]:
+        statement = select(self.sequence.next_value()).select_from(func.generate_series(1, size))
+        result = await session.execute(statement)
+        return list(result.scalars().all())
+
+
+alias_id_allocator = AliasIdAllocator(block_size=config.aliases.ALIAS_ID_BLOCK_SIZE)
@@ -0,0 +1,113 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from url_alias.domains.aliases.models import Alias
+from url_alias.shared.config import get_config
+
+config = get_config()
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedAlias:
+    """Minimal alias data needed to serve a redirect."""
+
+    id: int
+    target_url: str
+    is_enabled: bool
+    expires_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, alias: Alias) -> "ResolvedAlias":
+        return cls(id=alias.id, target_url=alias.target_url, is_enabled=alias.is_enabled, expires_at=alias.expires_at)
+
+
+class AliasResolutionCache:
+    """
+    Bounded LRU cache of short_code -> ResolvedAlias.
+
+    Entries live for at most ``ttl_seconds`` and never past the alias's own ``expires_at``.
+    The cache is per process, so with several workers a deactivation is only guaranteed
+    to be visible everywhere once the TTL has elapsed.
+
+    Invalidated codes are remembered for ``invalidation_window_seconds``, so that a
+    lookup right after a change can skip a lagging replica instead of caching the old
+    row again for a full TTL.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, invalidation_window_seconds: float = 0.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.invalidation_window_seconds = invalidation_window_seconds
+        self._entries: OrderedDict[str, tuple[float, ResolvedAlias]] = OrderedDict()
+        self._invalidated: OrderedDict[str, float] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, short_code: str) -> Optional[ResolvedAlias]:
+        """Return the cached alias, or None if it is missing or stale."""
+        entry = self._entries.get(short_code)
+        if entry is None:
+            return None
+
+        deadline, alias = entry
+        if deadline <= time.monotonic():
+            del self._entries[short_code]
+            return None
+
+        self._entries.move_to_end(short_code)
+        return alias
+
+    def set(self, short_code: str, alias: ResolvedAlias) -> None:
+        """Cache an alias, evicting the least recently used entries above max_size."""
+        if not self.enabled:
+            return
+
+        ttl = self.ttl_seconds
+        if alias.expires_at is not None:
+            remaining = (alias.expires_at - datetime.now(timezone.utc)).total_seconds()
+            if remaining <= 0:
+                return
+            ttl = min(ttl, remaining)
+
+        self._entries[short_code] = (time.monotonic() + ttl, alias)
+        self._entries.move_to_end(short_code)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, short_code: str) -> None:
+        self._entries.pop(short_code, None)
+        if self.invalidation_window_seconds > 0:
+            self._forget_old_invalidations()
+            self._invalidated[short_code] = time.monotonic() + self.invalidation_window_seconds
+            self._invalidated.move_to_end(short_code)
+
+    def invalidated_recently(self, short_code: str) -> bool:
+        """True if the code was invalidated within the last ``invalidation_window_seconds``."""
+        self._forget_old_invalidations()
+        return short_code in self._invalidated
+
+    def _forget_old_invalidations(self) -> None:
+        # Every entry gets the same window, so the earliest deadlines are at the front.
+        now = time.monotonic()
+        while self._invalidated and next(iter(self._invalidated.values())) <= now:
+            self._invalidated.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._invalidated.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+alias_resolution_cache = AliasResolutionCache(
+    max_size=config.alias_cache.ALIAS_CACHE_MAX_SIZE,
+    ttl_seconds=config.alias_cache.ALIAS_CACHE_TTL_SECONDS,
+    invalidation_window_seconds=config.db.POSTGRES_REPLICA_MAX_LAG_SECONDS if config.db.POSTGRES_REPLICA_DSN else 0.0,
+)
@@ -1,3 +1,7 @@
 MIN_SHORT_CODE_LENGTH = 1
 MAX_SHORT_CODE_LENGTH = 12
 DEFAULT_EXPIRY_DAYS = 1
+MAX_BATCH_SIZE = 10_000
+ALIAS_ID_SEQUENCE = "aliases_id_seq"
+ALIAS_CREATED_CHANNEL = "alias_created"
+ALIAS_EXPORT_FIELDS = ("short_url", "target_url", "expires_at", "is_enabled", "created_at")
@@ -0,0 +1,314 @@
+import csv
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, TextIO
+
+import asyncpg
+
+from url_alias.domains.aliases.constants import ALIAS_CREATED_CHANNEL, ALIAS_ID_SEQUENCE
+from url_alias.domains.aliases.schemas import validate_target_url
+from url_alias.domains.aliases.short_code_filter import notification_payloads
+from url_alias.domains.aliases.utils import MAX_ALIAS_ID, generate_short_code_from_id
+from url_alias.shared.config import get_config
+from url_alias.shared.logging import get_service_logger
+
+config = get_config()
+
+ALIAS_COLUMNS = ["id", "short_code", "target_url", "user_id", "expires_at", "is_enabled"]
+STATISTIC_COLUMNS = ["alias_id", "user_id", "total_clicks"]
+
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def from_path(cls, path: Path) -> "ImportFormat":
+        return cls.NDJSON if path.suffix.lower() in (".ndjson", ".jsonl") else cls.CSV
+
+
+@dataclass
+class ImportCheckpoint:
+    """
+    Progress of an import, saved after every chunk.
+
+    ``rows_done`` counts input rows, accepted or rejected, that are fully processed.
+    ``pending_first_id``/``pending_rows_done`` are written just before a chunk commits:
+    on resume, whether that chunk's first id exists tells if the commit happened.
+    """
+
+    path: str
+    input: str
+    rows_done: int = 0
+    imported: int = 0
+    rejected: int = 0
+    pending_first_id: Optional[int] = None
+    pending_rows_done: Optional[int] = None
+    pending_imported: Optional[int] = None
+    pending_rejected: Optional[int] = None
+
+    @classmethod
+    def load(cls, path: Path, input_path: Path) -> "ImportCheckpoint":
+        if not path.exists():
+            return cls(path=str(path), input=str(input_path.resolve()))
+
+        data = json.loads(path.read_text())
+        if data["input"] != str(input_path.resolve()):
+            raise ValueError(f"Checkpoint {path} belongs to a different input: {data['input']}")
+        return cls(**{**data, "path": str(path)})
+
+    def save(self) -> None:
+        """Write atomically, so a crash never leaves a truncated checkpoint."""
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump({key: value for key, value in asdict(self).items() if key != "path"}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+
+    def begin_chunk(self, first_id: Optional[int], rows_done: int, imported: int, rejected: int) -> None:
+        self.pending_first_id = first_id
+        self.pending_rows_done = rows_done
+        self.pending_imported = imported
+        self.pending_rejected = rejected
+        self.save()
+
+    def commit_chunk(self) -> None:
+        self.rows_done = self.pending_rows_done
+        self.imported = self.pending_imported
+        self.rejected = self.pending_rejected
+        self.pending_first_id = self.pending_rows_done = self.pending_imported = self.pending_rejected = None
+        self.save()
+
+    def abandon_chunk(self) -> None:
+        self.pending_first_id = self.pending_rows_done = self.pending_imported = self.pending_rejected = None
+        self.save()
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    rejected: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.imported / self.seconds if self.seconds else 0.0
+
+
+def read_rows(file: TextIO, import_format: ImportFormat) -> Iterator[dict[str, Any]]:
+    """Stream input rows as dicts; a line that is not valid JSON becomes an empty dict, rejected later."""
+    if import_format == ImportFormat.CSV:
+        yield from csv.DictReader(file)
+        return
+
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = {}
+        yield row if isinstance(row, dict) else {}
+
+
+def parse_row(
+    row: dict[str, Any], default_user_id: Optional[int]
+) -> tuple[str, Optional[int], Optional[datetime], bool]:
+    """Validate one input row. Raises ValueError with the reason if it must be rejected."""
+    target_url = row.get("target_url")
+    if not isinstance(target_url, str) or not target_url:
+        raise ValueError("target_url is missing")
+    validate_target_url(target_url)
+
+    user_id = row.get("user_id")
+    if user_id in (None, ""):
+        user_id = default_user_id
+    else:
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid user_id: {user_id!r}")
+
+    expires_at = row.get("expires_at")
+    if expires_at in (None, ""):
+        expires_at = None
+    else:
+        try:
+            expires_at = datetime.fromisoformat(str(expires_at))
+        except ValueError:
+            raise ValueError(f"Invalid expires_at: {expires_at!r}")
+        if expires_at.tzinfo is None:
+            raise ValueError("expires_at must include a timezone")
+
+    is_enabled = row.get("is_enabled")
+    if is_enabled in (None, ""):
+        is_enabled = True
+    elif isinstance(is_enabled, str):
+        if is_enabled.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(f"Invalid is_enabled: {is_enabled!r}")
+        is_enabled = is_enabled.lower() in ("true", "1")
+    else:
+        is_enabled = bool(is_enabled)
+
+    return target_url, user_id, expires_at, is_enabled
+
+
+class AliasImporter:
+    """
+    Bulk loader for aliases from CSV or NDJSON.
+
+    Input is read and validated in chunks. Each chunk gets a contiguous reservation of ids
+    from the aliases sequence, short codes are derived from the ids as usual, and the
+    aliases plus their zero-click statistics rows are written with COPY in one transaction.
+    The new codes are announced to running workers' short code filters in that transaction.
+
+    Progress is checkpointed after every chunk, so an interrupted import can be run again
+    with the same arguments and continues after the last committed chunk, without
+    importing any row twice.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 10_000,
+        default_user_id: Optional[int] = None,
+        dsn: str = config.db.asyncpg_dsn,
+    ):
+        self.chunk_size = chunk_size
+        self.default_user_id = default_user_id
+        self.dsn = dsn
+        self.logger = get_service_logger("aliases.importer")
+
+    async def run(
+        self,
+        input_path: Path,
+        import_format: Optional[ImportFormat] = None,
+        checkpoint_path: Optional[Path] = None,
+        rejects: Optional[TextIO] = None,
+    ) -> ImportReport:
+        import_format = import_format or ImportFormat.from_path(input_path)
+        checkpoint = ImportCheckpoint.load(checkpoint_path or Path(f"{input_path}.checkpoint"), input_path)
+        report = ImportReport()
+        started = time.perf_counter()
+
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            await self._settle_pending_chunk(connection, checkpoint)
+            report.skipped = checkpoint.rows_done
+            if checkpoint.rows_done:
+                self.logger.info(f"Resuming {input_path} after {checkpoint.rows_done} rows")
+
+            with open(input_path, newline="", encoding="utf-8") as file:
+                rows = islice(read_rows(file, import_format), checkpoint.rows_done, None)
+                row_number = checkpoint.rows_done
+                while chunk := list(islice(rows, self.chunk_size)):
+                    accepted, errors = await self._validate(connection, chunk, row_number)
+                    row_number += len(chunk)
+                    if rejects is not None and errors:
+                        rejects.writelines(error + "\n" for error in errors)
+                        rejects.flush()
+
+                    await self._load_chunk(connection, checkpoint, accepted, row_number, len(errors))
+                    report.imported += len(accepted)
+                    report.rejected += len(errors)
+
+                    elapsed = time.perf_counter() - started
+                    self.logger.info(
+                        f"Imported {checkpoint.imported} rows, rejected {checkpoint.rejected} "
+                        f"({round(report.imported / elapsed)} rows/s)"
+                    )
+        finally:
+            await connection.close()
+
+        report.seconds = time.perf_counter() - started
+        return report
+
+    async def _settle_pending_chunk(self, connection: asyncpg.Connection, checkpoint: ImportCheckpoint) -> None:
+        """Resolve a chunk that was interrupted between writing its checkpoint and finishing."""
+        if checkpoint.pending_first_id is None:
+            return
+
+        committed = await connection.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM aliases WHERE id = $1)", checkpoint.pending_first_id
+        )
+        if committed:
+            self.logger.info("Last chunk of the previous run was committed")
+            checkpoint.commit_chunk()
+        else:
+            self.logger.info("Last chunk of the previous run was rolled back, importing it again")
+            checkpoint.abandon_chunk()
+
+    async def _validate(
+        self, connection: asyncpg.Connection, chunk: List[dict[str, Any]], first_row_number: int
+    ) -> tuple[List[tuple], List[str]]:
+        parsed, errors = [], []
+        for row_number, row in enumerate(chunk, start=first_row_number + 1):
+            try:
+                parsed.append((row_number, *parse_row(row, self.default_user_id)))
+            except ValueError as e:
+                errors.append(f"row {row_number}: {e}")
+
+        user_ids = list({user_id for _, _, user_id, _, _ in parsed if user_id is not None})
+        known = {record["id"] for record in await connection.fetch("SELECT id FROM users WHERE id = ANY($1)", user_ids)}
+
+        accepted = []
+        for row_number, target_url, user_id, expires_at, is_enabled in parsed:
+            if user_id is not None and user_id not in known:
+                errors.append(f"row {row_number}: Unknown user_id: {user_id}")
+            else:
+                accepted.append((target_url, user_id, expires_at, is_enabled))
+        return accepted, errors
+
+    async def _load_chunk(
+        self,
+        connection: asyncpg.Connection,
+        checkpoint: ImportCheckpoint,
+        accepted: List[tuple],
+        rows_done: int,
+        rejected: int,
+    ) -> None:
+        imported = checkpoint.imported + len(accepted)
+        rejected = checkpoint.rejected + rejected
+        if not accepted:
+            checkpoint.begin_chunk(first_id=None, rows_done=rows_done, imported=imported, rejected=rejected)
+            checkpoint.commit_chunk()
+            return
+
+        async with connection.transaction():
+            ids = [
+                record[0]
+                for record in await connection.fetch(
+                    "SELECT nextval($1) FROM generate_series(1, $2)", ALIAS_ID_SEQUENCE, len(accepted)
+                )
+            ]
+            if ids[-1] > MAX_ALIAS_ID:
+                raise RuntimeError("The aliases id sequence is exhausted")
+
+            aliases = [
+                (alias_id, generate_short_code_from_id(alias_id), target_url, user_id, expires_at, is_enabled)
+                for alias_id, (target_url, user_id, expires_at, is_enabled) in zip(ids, accepted)
+            ]
+            await connection.copy_records_to_table("aliases", records=aliases, columns=ALIAS_COLUMNS)
+            await connection.copy_records_to_table(
+                "alias_statistics",
+                records=[(alias_id, user_id, 0) for alias_id, _, _, user_id, _, _ in aliases],
+                columns=STATISTIC_COLUMNS,
+            )
+            await connection.execute(
+                "SELECT pg_notify($1, payload) FROM unnest($2::text[]) AS payload",
+                ALIAS_CREATED_CHANNEL,
+                notification_payloads([short_code for _, short_code, _, _, _, _ in aliases]),
+            )
+
+            # From here on the chunk may commit even if this process dies before the
+            # checkpoint is updated; the pending id lets the next run find out.
+            checkpoint.begin_chunk(first_id=ids[0], rows_done=rows_done, imported=imported, rejected=rejected)
+
+        checkpoint.commit_chunk()
@@ -1,19 +1,51 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from url_alias.db.database import Base
 from url_alias.db.model import BaseModel
 
 
 class Alias(BaseModel):
     __tablename__ = "aliases"
 
-    target_url: Mapped[str] = mapped_column(String, nullable=False, index=True)
-    short_code: Mapped[Optional[str]] = mapped_column(String(12), unique=True, index=True, nullable=True)
-    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    target_url: Mapped[str] = mapped_column(String, nullable=False)
+    # Derived from the id, so it is unique by construction and looked up through the primary key.
+    short_code: Mapped[Optional[str]] = mapped_column(String(12), nullable=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     is_enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     statistics = relationship("AliasStatistic", back_populates="alias", uselist=False)
+
+
+# Listing a user's aliases: newest first, with the id as keyset tie breaker.
+Index("ix_aliases_user_id_created_at", Alias.user_id, Alias.created_at.desc(), Alias.id.desc())
+# Same listing with active_only. expires_at cannot go into the predicate, it is checked on the heap row.
+Index(
+    "ix_aliases_enabled_user_id_created_at",
+    Alias.user_id,
+    Alias.created_at.desc(),
+    Alias.id.desc(),
+    postgresql_where=Alias.is_enabled == True,  # noqa: E712
+)
+# Finding expired aliases for the reaper, oldest first.
+Index("ix_aliases_expires_at", Alias.expires_at, postgresql_where=Alias.expires_at.isnot(None))
+
+
+class ArchivedAlias(Base):
+    """Expired aliases moved out of ``aliases`` by the reaper, with their original ids and timestamps."""
+
+    __tablename__ = "archived_aliases"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    target_url: Mapped[str] = mapped_column(String, nullable=False)
+    short_code: Mapped[Optional[str]] = mapped_column(String(12), nullable=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    is_enabled: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
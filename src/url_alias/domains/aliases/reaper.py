@@ -0,0 +1,125 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from url_alias.db.database import async_session_factory
+from url_alias.domains.aliases.repository import AliasRepository
+from url_alias.shared.background import PeriodicTask
+from url_alias.shared.config import get_config
+from url_alias.shared.logging import get_service_logger
+from url_alias.shared.prometheus import Counter, Gauge
+
+config = get_config()
+
+aliases_archived = Counter("url_alias_aliases_archived", "Expired aliases moved to the archive tables.")
+# Every worker counts the same table, so report one count rather than their sum.
+reaper_backlog = Gauge(
+    "url_alias_reaper_backlog",
+    "Expired aliases waiting to be archived, as of the last reaper run.",
+    multiprocess_mode="max",
+)
+
+
+@dataclass
+class ReaperStats:
+    """Counters of one reaper, cumulative since the process started except for the ``last_*`` fields."""
+
+    runs: int = 0
+    batches: int = 0
+    archived: int = 0
+    seconds: float = 0.0
+    last_archived: int = 0
+    last_rows_per_second: float = 0.0
+    # Expired aliases still waiting to be archived, counted at the end of the last run.
+    backlog: int = 0
+    last_run_at: Optional[datetime] = None
+
+
+class ExpiredAliasReaper:
+    """
+    Periodically moves aliases that expired more than ``grace_period`` ago into the archive tables.
+
+    Each run works in small batches, each in its own short transaction, with a pause in between
+    so that neither locks nor WAL volume build up. Safe to run from several workers and from the
+    CLI at the same time: batches are claimed with FOR UPDATE SKIP LOCKED.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        grace_period_hours: float,
+        batch_size: int,
+        batch_pause_seconds: float,
+        interval_seconds: float,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ):
+        self.enabled = enabled
+        self.grace_period = timedelta(hours=grace_period_hours)
+        self.batch_size = batch_size
+        self.batch_pause_seconds = batch_pause_seconds
+        self.session_factory = session_factory
+        self.stats = ReaperStats()
+        self.logger = get_service_logger("aliases.reaper")
+        self._run_lock = asyncio.Lock()
+        self._task = PeriodicTask("expired-alias-reaper", self.run_once, interval_seconds)
+
+    async def run_once(self, max_batches: Optional[int] = None) -> int:
+        """Archive expired aliases until none are left, or ``max_batches`` were done. Returns the count."""
+        async with self._run_lock:
+            cutoff = datetime.now(timezone.utc) - self.grace_period
+            started = time.perf_counter()
+            archived = batches = 0
+
+            while max_batches is None or batches < max_batches:
+                async with self.session_factory() as session:
+                    count = await AliasRepository(session=session).archive_expired(cutoff, self.batch_size)
+                    await session.commit()
+                archived += count
+                batches += 1
+                if count < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_pause_seconds)
+
+            async with self.session_factory() as session:
+                backlog = await AliasRepository(session=session).count_expired(cutoff)
+
+            elapsed = time.perf_counter() - started
+            self._record(archived, batches, elapsed, backlog)
+            self.logger.info(
+                f"Archived {archived} aliases expired before {cutoff.isoformat()} in {batches} batches "
+                f"({round(self.stats.last_rows_per_second)} rows/s), {backlog} left"
+            )
+            return archived
+
+    def _record(self, archived: int, batches: int, elapsed: float, backlog: int) -> None:
+        self.stats.runs += 1
+        self.stats.batches += batches
+        self.stats.archived += archived
+        self.stats.seconds += elapsed
+        self.stats.last_archived = archived
+        self.stats.last_rows_per_second = archived / elapsed if elapsed else 0.0
+        self.stats.backlog = backlog
+        self.stats.last_run_at = datetime.now(timezone.utc)
+        aliases_archived.inc(archived)
+        reaper_backlog.set(backlog)
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self._task.start()
+
+    async def stop(self) -> None:
+        await self._task.stop()
+
+
+expired_alias_reaper = ExpiredAliasReaper(
+    enabled=config.reaper.ALIAS_REAPER_ENABLED,
+    grace_period_hours=config.reaper.ALIAS_REAPER_GRACE_PERIOD_HOURS,
+    batch_size=config.reaper.ALIAS_REAPER_BATCH_SIZE,
+    batch_pause_seconds=config.reaper.ALIAS_REAPER_BATCH_PAUSE_SECONDS,
+    interval_seconds=config.reaper.ALIAS_REAPER_INTERVAL_SECONDS,
+)
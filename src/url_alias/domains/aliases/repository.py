@@ -1,12 +1,20 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Boolean, DateTime, Integer, Row, String, bindparam, delete, func, insert, select, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from url_alias.db.repository import BaseRepository
 from url_alias.db.schema import AppBaseSchema
-from url_alias.domains.aliases.models import Alias
+from url_alias.domains.aliases.models import Alias, ArchivedAlias
+from url_alias.domains.aliases.utils import short_code_to_alias_id
+from url_alias.domains.statistics.models import (
+    AliasClickBucket,
+    AliasClickHourlyBucket,
+    AliasStatistic,
+    ArchivedAliasStatistic,
+)
 
 
 class AliasRepoInput(AppBaseSchema):
@@ -17,7 +25,8 @@ class AliasRepoInput(AppBaseSchema):
 
 
 class AliasRepoCreate(AliasRepoInput):
-    pass
+    id: Optional[int] = None
+    short_code: Optional[str] = None
 
 
 class AliasRepoUpdate(AliasRepoInput):
@@ -30,9 +39,72 @@ class AliasRepository(BaseRepository[Alias, AliasRepoCreate, AliasRepoUpdate]):
     def __init__(self, session: AsyncSession):
         super().__init__(model=Alias, session=session)
 
+    async def insert(self, obj_in: AliasRepoCreate) -> Alias:
+        """Insert an alias and load it back in a single round trip (INSERT ... RETURNING)."""
+        statement = insert(self.model).values(**obj_in.model_dump(exclude_none=True)).returning(self.model)
+        result = await self.session.execute(statement)
+        return result.scalar_one()
+
+    async def insert_many(self, objs_in: List[AliasRepoCreate]) -> List[Alias]:
+        """
+        Insert many aliases with explicit ids in one statement and one round trip.
+
+        Rows are passed as one array per column and expanded with unnest(), so the
+        statement size does not depend on the number of rows.
+        """
+        if not objs_in:
+            return []
+
+        # Values are bound on the parameters themselves: passing them to execute() would make
+        # the ORM treat the statement as a bulk insert keyed by parameter name.
+        incoming = (
+            func.unnest(
+                bindparam("ids", [obj.id for obj in objs_in], type_=ARRAY(Integer)),
+                bindparam("short_codes", [obj.short_code for obj in objs_in], type_=ARRAY(String)),
+                bindparam("target_urls", [obj.target_url for obj in objs_in], type_=ARRAY(String)),
+                bindparam("user_ids", [obj.user_id for obj in objs_in], type_=ARRAY(Integer)),
+                bindparam("expires_at", [obj.expires_at for obj in objs_in], type_=ARRAY(DateTime(timezone=True))),
+                bindparam("is_enabled", [obj.is_enabled for obj in objs_in], type_=ARRAY(Boolean)),
+            )
+            .table_valued("id", "short_code", "target_url", "user_id", "expires_at", "is_enabled")
+            .render_derived()
+        )
+        statement = (
+            insert(self.model)
+            .from_select(
+                [
+                    self.model.id,
+                    self.model.short_code,
+                    self.model.target_url,
+                    self.model.user_id,
+                    self.model.expires_at,
+                    self.model.is_enabled,
+                ],
+                select(
+                    incoming.c.id,
+                    incoming.c.short_code,
+                    incoming.c.target_url,
+                    incoming.c.user_id,
+                    incoming.c.expires_at,
+                    incoming.c.is_enabled,
+                ),
+            )
+            .returning(self.model)
+        )
+
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
     async def get_by_short_code(self, short_code: str) -> Optional[Alias]:
-        """Get an alias by its short code."""
-        statement = select(self.model).where(self.model.short_code == short_code)
+        """Get an alias by its short code, looked up by the primary key the code decodes to."""
+        alias_id = short_code_to_alias_id(short_code)
+        if alias_id is None:
+            return None
+        return await self.get_by_id_and_short_code(alias_id, short_code)
+
+    async def get_by_id_and_short_code(self, alias_id: int, short_code: str) -> Optional[Alias]:
+        """Get an alias by primary key, provided its stored short code matches."""
+        statement = select(self.model).where(self.model.id == alias_id, self.model.short_code == short_code)
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
@@ -43,10 +115,30 @@ class AliasRepository(BaseRepository[Alias, AliasRepoCreate, AliasRepoUpdate]):
         return list(results.scalars().all())
 
     async def get_user_aliases(
-        self, user_id: int, active_only: bool = False, limit: int = 100, offset: int = 0
-    ) -> List[Alias]:
-        """Get aliases for a specific user with pagination."""
-        statement = select(self.model).where(self.model.user_id == user_id)
+        self,
+        user_id: int,
+        active_only: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> List[Row]:
+        """
+        Get aliases for a specific user, newest first, with pagination.
+
+        ``after`` is the (created_at, id) of the last alias of the previous page; when given,
+        the page starts right after it instead of skipping ``offset`` rows. Rows hold plain
+        column values rather than ORM instances, which listings only serialize.
+        """
+        statement = select(
+            self.model.id,
+            self.model.created_at,
+            self.model.updated_at,
+            self.model.target_url,
+            self.model.short_code,
+            self.model.user_id,
+            self.model.expires_at,
+            self.model.is_enabled,
+        ).where(self.model.user_id == user_id)
 
         if active_only:
             now = datetime.now(timezone.utc)
@@ -55,10 +147,33 @@ class AliasRepository(BaseRepository[Alias, AliasRepoCreate, AliasRepoUpdate]):
                 (self.model.expires_at.is_(None)) | (self.model.expires_at > now),
             )
 
-        statement = statement.order_by(self.model.created_at.desc()).limit(limit).offset(offset)
+        if after is not None:
+            statement = statement.where(tuple_(self.model.created_at, self.model.id) < tuple_(*after))
+
+        statement = statement.order_by(self.model.created_at.desc(), self.model.id.desc()).limit(limit).offset(offset)
 
         results = await self.session.execute(statement)
-        return list(results.scalars().all())
+        return list(results.all())
+
+    async def stream_user_aliases(self, user_id: int, chunk_size: int = 1_000) -> AsyncIterator[Sequence[Row]]:
+        """Yield all of a user's aliases, newest first, in chunks through a server-side cursor."""
+        statement = (
+            select(
+                self.model.id,
+                self.model.short_code,
+                self.model.target_url,
+                self.model.expires_at,
+                self.model.is_enabled,
+                self.model.created_at,
+            )
+            .where(self.model.user_id == user_id)
+            .order_by(self.model.created_at.desc(), self.model.id.desc())
+            .execution_options(yield_per=chunk_size)
+        )
+
+        result = await self.session.stream(statement)
+        async for chunk in result.partitions():
+            yield chunk
 
     async def get_by_id_and_user(self, alias_id: int, user_id: int) -> Optional[Alias]:
         """Get an alias by ID if it belongs to the specified user."""
@@ -68,6 +183,133 @@ class AliasRepository(BaseRepository[Alias, AliasRepoCreate, AliasRepoUpdate]):
 
     async def get_by_short_code_and_user(self, short_code: str, user_id: int) -> Optional[Alias]:
         """Get an alias by short code if it belongs to the specified user."""
-        statement = select(self.model).where(self.model.short_code == short_code, self.model.user_id == user_id)
+        alias_id = short_code_to_alias_id(short_code)
+        if alias_id is None:
+            return None
+
+        statement = select(self.model).where(
+            self.model.id == alias_id, self.model.short_code == short_code, self.model.user_id == user_id
+        )
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
+
+    async def estimate_count(self) -> int:
+        """Planner estimate of the number of aliases; cheap, unlike count(*)."""
+        result = await self.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": self.model.__tablename__},
+        )
+        return max(result.scalar_one(), 0)
+
+    async def stream_active_short_codes(self, now: datetime, chunk_size: int = 10_000) -> AsyncIterator[List[str]]:
+        """Yield short codes of enabled, unexpired aliases in chunks, through a server-side cursor."""
+        statement = (
+            select(self.model.short_code)
+            .where(
+                self.model.short_code.isnot(None),
+                self.model.is_enabled == True,  # noqa: E712
+                (self.model.expires_at.is_(None)) | (self.model.expires_at > now),
+            )
+            .execution_options(yield_per=chunk_size)
+        )
+
+        result = await self.session.stream_scalars(statement)
+        async for chunk in result.partitions():
+            yield chunk
+
+    async def count_expired(self, expired_before: datetime) -> int:
+        """Number of aliases that expired before ``expired_before``, counted on ix_aliases_expires_at."""
+        statement = select(func.count()).select_from(self.model).where(self.model.expires_at < expired_before)
+        result = await self.session.execute(statement)
+        return result.scalar_one()
+
+    async def archive_expired(self, expired_before: datetime, batch_size: int) -> int:
+        """
+        Move up to ``batch_size`` aliases that expired before ``expired_before`` and their
+        statistics into the archive tables, and delete their click buckets.
+
+        Everything happens in one statement. The batch is locked with FOR UPDATE SKIP LOCKED,
+        so concurrent reapers take disjoint batches and rows locked by other transactions are
+        left for a later run instead of being waited for. Returns the number of aliases archived.
+        """
+        statistic = AliasStatistic
+        batch = (
+            select(self.model.id)
+            .where(self.model.expires_at < expired_before)
+            .order_by(self.model.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+        )
+        batch_ids = select(batch.c.id)
+
+        minute_buckets = delete(AliasClickBucket).where(AliasClickBucket.alias_id.in_(batch_ids)).cte("minute_buckets")
+        hourly_buckets = (
+            delete(AliasClickHourlyBucket).where(AliasClickHourlyBucket.alias_id.in_(batch_ids)).cte("hourly_buckets")
+        )
+        statistics = (
+            delete(statistic)
+            .where(statistic.alias_id.in_(batch_ids))
+            .returning(
+                statistic.alias_id,
+                statistic.user_id,
+                statistic.total_clicks,
+                statistic.last_clicked_at,
+                statistic.created_at,
+                statistic.updated_at,
+            )
+            .cte("statistics")
+        )
+        archived_statistics = (
+            insert(ArchivedAliasStatistic)
+            .from_select(
+                [
+                    ArchivedAliasStatistic.alias_id,
+                    ArchivedAliasStatistic.user_id,
+                    ArchivedAliasStatistic.total_clicks,
+                    ArchivedAliasStatistic.last_clicked_at,
+                    ArchivedAliasStatistic.created_at,
+                    ArchivedAliasStatistic.updated_at,
+                ],
+                select(statistics),
+            )
+            .cte("archived_statistics")
+        )
+        aliases = (
+            delete(self.model)
+            .where(self.model.id.in_(batch_ids))
+            .returning(
+                self.model.id,
+                self.model.target_url,
+                self.model.short_code,
+                self.model.user_id,
+                self.model.expires_at,
+                self.model.is_enabled,
+                self.model.created_at,
+                self.model.updated_at,
+            )
+            .cte("aliases")
+        )
+        # Foreign keys are checked at the end of the statement, after the buckets and
+        # statistics rows above are gone. CTEs that are not referenced still have to be
+        # attached, or they would not be rendered.
+        statement = (
+            insert(ArchivedAlias)
+            .from_select(
+                [
+                    ArchivedAlias.id,
+                    ArchivedAlias.target_url,
+                    ArchivedAlias.short_code,
+                    ArchivedAlias.user_id,
+                    ArchivedAlias.expires_at,
+                    ArchivedAlias.is_enabled,
+                    ArchivedAlias.created_at,
+                    ArchivedAlias.updated_at,
+                ],
+                select(aliases),
+            )
+            .add_cte(minute_buckets, hourly_buckets, archived_statistics)
+        )
+
+        result = await self.session.execute(statement)
+        return result.rowcount
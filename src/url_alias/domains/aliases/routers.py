@@ -1,12 +1,23 @@
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
+from url_alias.domains.aliases.constants import ALIAS_EXPORT_FIELDS
 from url_alias.domains.aliases.dependencies import get_alias_service
-from url_alias.domains.aliases.schemas import AliasCreateRequest, AliasRead
+from url_alias.domains.aliases.schemas import (
+    AliasBatchCreateRequest,
+    AliasBatchCreateResponse,
+    AliasBatchResult,
+    AliasCreateRequest,
+    AliasRead,
+)
 from url_alias.domains.aliases.services import AliasService
 from url_alias.domains.users.dependencies import get_current_active_user
 from url_alias.domains.users.models import User as UserModel
+from url_alias.shared.export import ExportFormat, export_response
+from url_alias.shared.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from url_alias.shared.responses import RowsJSONResponse
 
 router = APIRouter(
     prefix="/aliases",
@@ -31,6 +42,21 @@ def create_alias_read(alias, request: Request) -> AliasRead:
     )
 
 
+def alias_read_row(alias, base_url: str, now: datetime) -> dict:
+    """AliasRead as a plain dict for RowsJSONResponse: same keys, same order, same is_active."""
+    return {
+        "id": alias.id,
+        "created_at": alias.created_at,
+        "updated_at": alias.updated_at,
+        "target_url": alias.target_url,
+        "short_url": f"{base_url}/{alias.short_code}",
+        "user_id": alias.user_id,
+        "expires_at": alias.expires_at,
+        "is_enabled": alias.is_enabled,
+        "is_active": alias.is_enabled and not (alias.expires_at and alias.expires_at < now),
+    }
+
+
 @router.post("", response_model=AliasRead, status_code=status.HTTP_201_CREATED)
 async def create_alias(
     request: Request,
@@ -57,24 +83,66 @@ async def create_alias(
         )
 
 
-@router.get("", response_model=List[AliasRead])
+@router.post("/batch", response_model=AliasBatchCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_aliases_batch(
+    request: Request,
+    batch_request: AliasBatchCreateRequest,
+    alias_service: AliasService = Depends(get_alias_service),
+    current_user: UserModel = Depends(get_current_active_user),
+):
+    """
+    Create up to 10 000 aliases in one request. Requires Basic Auth.
+    Results are returned in input order; items with an invalid target_url are reported
+    with an error and do not prevent the others from being created.
+    """
+    try:
+        outcomes = await alias_service.create_aliases_batch(items=batch_request.items, user_id=current_user.id)
+
+        results = [
+            (
+                AliasBatchResult(index=index, error=outcome)
+                if isinstance(outcome, str)
+                else AliasBatchResult(index=index, alias=create_alias_read(outcome, request))
+            )
+            for index, outcome in enumerate(outcomes)
+        ]
+        failed = sum(1 for result in results if result.error is not None)
+
+        return AliasBatchCreateResponse(created=len(results) - failed, failed=failed, results=results)
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while creating the aliases.",
+        )
+
+
+@router.get("", response_model=List[AliasRead], response_class=RowsJSONResponse)
 async def get_user_aliases(
     request: Request,
     alias_service: AliasService = Depends(get_alias_service),
     current_user: UserModel = Depends(get_current_active_user),
     active_only: bool = False,
-    page: int = Query(default=1, ge=1, description="Page number (starts from 1)"),
+    page: int = Query(default=1, ge=1, description="Page number (starts from 1). Ignored when cursor is set"),
     page_size: int = Query(default=20, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(default=None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
 ):
     """
-    Get list of user's aliases with pagination. Requires Basic Auth.
+    Get list of user's aliases, newest first, with pagination. Requires Basic Auth.
+    If there are more aliases, the cursor for the next page is returned in the X-Next-Cursor header.
+    Cursor pagination costs the same at any depth, page numbers get slower the deeper they go.
     """
     try:
         offset = (page - 1) * page_size
-        aliases = await alias_service.get_user_aliases(
-            user_id=current_user.id, active_only=active_only, limit=page_size, offset=offset
+        aliases_page = await alias_service.get_user_aliases(
+            user_id=current_user.id, active_only=active_only, limit=page_size, offset=offset, cursor=cursor
         )
-        return [create_alias_read(alias, request) for alias in aliases]
+        base_url = str(request.base_url).rstrip("/")
+        now = datetime.now(timezone.utc)
+        headers = {NEXT_CURSOR_HEADER: aliases_page.next_cursor} if aliases_page.next_cursor else None
+        return RowsJSONResponse([alias_read_row(alias, base_url, now) for alias in aliases_page.items], headers=headers)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -82,6 +150,27 @@ async def get_user_aliases(
         )
 
 
+@router.get("/export")
+async def export_user_aliases(
+    request: Request,
+    current_user: UserModel = Depends(get_current_active_user),
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format", description="ndjson or csv"),
+):
+    """
+    Download all of the user's aliases, newest first, as NDJSON or CSV. Requires Basic Auth.
+    Rows are streamed from a server-side cursor, so any number of aliases can be exported.
+    """
+    base_url = str(request.base_url).rstrip("/")
+    user_id = current_user.id
+
+    return export_response(
+        lambda session: AliasService(session=session).export_user_aliases(user_id=user_id, base_url=base_url),
+        export_format=export_format,
+        fields=ALIAS_EXPORT_FIELDS,
+        filename="aliases",
+    )
+
+
 @router.patch("/{short_code}/deactivate", response_model=AliasRead)
 async def deactivate_alias(
     request: Request,
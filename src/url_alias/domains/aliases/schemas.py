@@ -1,11 +1,16 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import List, Optional
 from urllib.parse import urlparse
 
 from pydantic import Field, computed_field, field_validator
 
 from url_alias.db.schema import AppBaseSchema, BaseSchema
-from url_alias.domains.aliases.constants import DEFAULT_EXPIRY_DAYS, MAX_SHORT_CODE_LENGTH, MIN_SHORT_CODE_LENGTH
+from url_alias.domains.aliases.constants import (
+    DEFAULT_EXPIRY_DAYS,
+    MAX_BATCH_SIZE,
+    MAX_SHORT_CODE_LENGTH,
+    MIN_SHORT_CODE_LENGTH,
+)
 
 
 def validate_target_url(url: str) -> str:
@@ -51,8 +56,8 @@ class AliasBase(AppBaseSchema):
         return validate_target_url(v)
 
 
-class AliasCreateRequest(AppBaseSchema):
-    """Schema for creating a new alias via API."""
+class AliasCreateFields(AppBaseSchema):
+    """Fields accepted when creating an alias, without URL validation."""
 
     target_url: str = Field(..., examples=["https://example.com/very/long/url?for=sharing"])
     expires_at: Optional[datetime] = Field(
@@ -63,6 +68,10 @@ class AliasCreateRequest(AppBaseSchema):
         True, description="Whether the alias should be manually enabled upon creation. Defaults to True."
     )
 
+
+class AliasCreateRequest(AliasCreateFields):
+    """Schema for creating a new alias via API."""
+
     @field_validator("target_url")
     @classmethod
     def validate_target_url_field(cls, v: str) -> str:
@@ -101,3 +110,29 @@ class AliasRead(BaseSchema):
         if self.expires_at and self.expires_at < datetime.now(timezone.utc):
             return False
         return True
+
+
+class AliasBatchItem(AliasCreateFields):
+    """Single batch item. target_url is validated per item, so one bad URL does not fail the whole batch."""
+
+
+class AliasBatchCreateRequest(AppBaseSchema):
+    """Schema for creating many aliases in one request."""
+
+    items: List[AliasBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class AliasBatchResult(AppBaseSchema):
+    """Outcome of a single batch item, reported at the item's position in the request."""
+
+    index: int = Field(..., description="Position of the item in the request")
+    alias: Optional[AliasRead] = Field(None, description="The created alias, if the item was accepted")
+    error: Optional[str] = Field(None, description="Why the item was rejected, if it was")
+
+
+class AliasBatchCreateResponse(AppBaseSchema):
+    """Schema for the response of a batch creation request."""
+
+    created: int = Field(..., description="Number of aliases created")
+    failed: int = Field(..., description="Number of rejected items")
+    results: List[AliasBatchResult]
@@ -1,73 +1,188 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Union
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from url_alias.domains.aliases.allocator import alias_id_allocator
+from url_alias.domains.aliases.cache import ResolvedAlias, alias_resolution_cache
 from url_alias.domains.aliases.models import Alias
 from url_alias.domains.aliases.repository import AliasRepoCreate, AliasRepository, AliasRepoUpdate
-from url_alias.domains.aliases.schemas import AliasCreateRequest
-from url_alias.domains.aliases.utils import generate_short_code_from_id
+from url_alias.domains.aliases.schemas import AliasBatchItem, AliasCreateRequest, validate_target_url
+from url_alias.domains.aliases.short_code_filter import short_code_filter
+from url_alias.domains.aliases.utils import generate_short_code_from_id, short_code_to_alias_id
+from url_alias.domains.statistics.repository import StatisticRepository
+from url_alias.shared.export import EXPORT_CHUNK_SIZE
 from url_alias.shared.logging import get_service_logger
+from url_alias.shared.pagination import Page, decode_cursor, paginate
 
 
 class AliasService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
+        """``read_session`` serves lag-tolerant reads, usually from a replica; writes always use ``session``."""
         self.session = session
+        self.read_session = read_session or session
         self.alias_repository = AliasRepository(session=session)
+        self.alias_read_repository = AliasRepository(session=self.read_session)
+        self.statistic_repository = StatisticRepository(session=session)
+        self.resolution_cache = alias_resolution_cache
+        self.id_allocator = alias_id_allocator
+        self.short_code_filter = short_code_filter
         self.logger = get_service_logger("aliases")
 
     async def create_alias(self, *, alias_create_request: AliasCreateRequest, user_id: Optional[int] = None) -> Alias:
-        """Orchestrates the creation of a new alias, including short_code generation."""
+        """
+        Orchestrates the creation of a new alias, including short_code generation.
+
+        The id comes from a pre-reserved block, so the short code is known up front and
+        the row is written with a single INSERT. Its zero-click statistics row is created
+        in the same transaction.
+        """
         self.logger.info(f"Creating new alias for URL: {alias_create_request.target_url}, user_id: {user_id}")
 
         try:
+            [alias_id] = await self.id_allocator.allocate(self.session)
+            generated_short_code = AliasService._generate_short_code(alias_id)
+            self.logger.debug(f"Generated short code: {generated_short_code} for alias ID: {alias_id}")
+
             repo_create_data = AliasRepoCreate(
+                id=alias_id,
+                short_code=generated_short_code,
                 target_url=alias_create_request.target_url,
                 expires_at=alias_create_request.expires_at,
                 user_id=user_id,
                 is_enabled=alias_create_request.is_enabled,
             )
+            created_alias = await self.alias_repository.insert(obj_in=repo_create_data)
+            await self.statistic_repository.create_for_aliases([created_alias])
+            await self.short_code_filter.publish(self.session, [generated_short_code])
+
+            self.logger.info(
+                f"Successfully created alias with ID: {created_alias.id}, short_code: {created_alias.short_code}"
+            )
+            return created_alias
+
+        except Exception as e:
+            self.logger.error(f"Failed to create alias for URL {alias_create_request.target_url}: {str(e)}")
+            raise
 
-            created_alias = await self.alias_repository.create(obj_in=repo_create_data)
+    async def create_aliases_batch(
+        self, *, items: List[AliasBatchItem], user_id: Optional[int] = None
+    ) -> List[Union[Alias, str]]:
+        """
+        Create many aliases with one id reservation and one multi-row INSERT.
 
-            if created_alias.id is None:
-                self.logger.error("Failed to obtain ID for the new alias after initial creation")
-                raise RuntimeError("Failed to obtain ID for the new alias after initial creation.")
+        Returns one entry per item, in input order: the created Alias, or the
+        validation error message for an item whose target_url was rejected.
+        """
+        self.logger.info(f"Creating batch of {len(items)} aliases for user_id: {user_id}")
 
-            generated_short_code = AliasService._generate_short_code(created_alias.id)
-            self.logger.debug(f"Generated short code: {generated_short_code} for alias ID: {created_alias.id}")
+        results: List[Union[Alias, str]] = [""] * len(items)
+        accepted: List[int] = []
+        for index, item in enumerate(items):
+            try:
+                validate_target_url(item.target_url)
+            except ValueError as e:
+                results[index] = str(e)
+            else:
+                accepted.append(index)
 
-            repo_update_data = AliasRepoUpdate(short_code=generated_short_code)
-            final_alias = await self.alias_repository.update(db_obj=created_alias, obj_in=repo_update_data)
+        if not accepted:
+            self.logger.warning(f"Rejected all {len(items)} batch items for user_id: {user_id}")
+            return results
+
+        try:
+            alias_ids = await self.id_allocator.allocate(self.session, count=len(accepted))
+            repo_create_data = [
+                AliasRepoCreate(
+                    id=alias_id,
+                    short_code=AliasService._generate_short_code(alias_id),
+                    target_url=items[index].target_url,
+                    expires_at=items[index].expires_at,
+                    user_id=user_id,
+                    # An explicit null means the default, as it does for a missing field.
+                    is_enabled=items[index].is_enabled is not False,
+                )
+                for index, alias_id in zip(accepted, alias_ids)
+            ]
+            created_aliases = await self.alias_repository.insert_many(repo_create_data)
+            await self.statistic_repository.create_for_aliases(created_aliases)
+            created_by_id = {alias.id: alias for alias in created_aliases}
+            await self.short_code_filter.publish(self.session, [obj.short_code for obj in repo_create_data])
+
+            for index, alias_id in zip(accepted, alias_ids):
+                results[index] = created_by_id[alias_id]
 
             self.logger.info(
-                f"Successfully created alias with ID: {final_alias.id}, short_code: {final_alias.short_code}"
+                f"Successfully created {len(accepted)} aliases, rejected {len(items) - len(accepted)} "
+                f"for user_id: {user_id}"
             )
-            return final_alias
+            return results
 
         except Exception as e:
-            self.logger.error(f"Failed to create alias for URL {alias_create_request.target_url}: {str(e)}")
+            self.logger.error(f"Failed to create batch of {len(items)} aliases for user_id {user_id}: {str(e)}")
             raise
 
     async def get_user_aliases(
-        self, user_id: int, active_only: bool = False, limit: int = 100, offset: int = 0
-    ) -> List[Alias]:
-        """Get aliases for a specific user with pagination."""
+        self,
+        user_id: int,
+        active_only: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Page[Row]:
+        """
+        Get aliases for a specific user with pagination.
+        With a cursor the page is found by keyset and offset is ignored.
+        """
         self.logger.info(
-            f"Fetching aliases for user {user_id}, active_only: {active_only}, limit: {limit}, offset: {offset}"
+            f"Fetching aliases for user {user_id}, active_only: {active_only}, limit: {limit}, "
+            f"offset: {offset}, cursor: {cursor}"
         )
 
+        after = decode_cursor(cursor, datetime, int) if cursor else None
+
         try:
-            aliases = await self.alias_repository.get_user_aliases(
-                user_id=user_id, active_only=active_only, limit=limit, offset=offset
+            aliases = await self.alias_read_repository.get_user_aliases(
+                user_id=user_id,
+                active_only=active_only,
+                limit=limit + 1,
+                offset=0 if after else offset,
+                after=after,
             )
-            self.logger.info(f"Successfully fetched {len(aliases)} aliases for user {user_id}")
-            return aliases
+            page = paginate(aliases, limit, "created_at", "id")
+            self.logger.info(f"Successfully fetched {len(page.items)} aliases for user {user_id}")
+            return page
 
         except Exception as e:
             self.logger.error(f"Failed to fetch aliases for user {user_id}: {str(e)}")
             raise
 
+    async def export_user_aliases(self, user_id: int, base_url: str) -> AsyncIterator[List[dict]]:
+        """Yield all of a user's aliases as export rows, one chunk at a time."""
+        self.logger.info(f"Exporting aliases for user {user_id}")
+
+        exported = 0
+        try:
+            async for chunk in self.alias_repository.stream_user_aliases(user_id=user_id, chunk_size=EXPORT_CHUNK_SIZE):
+                yield [
+                    {
+                        "short_url": f"{base_url}/{row.short_code}",
+                        "target_url": row.target_url,
+                        "expires_at": row.expires_at,
+                        "is_enabled": row.is_enabled,
+                        "created_at": row.created_at,
+                    }
+                    for row in chunk
+                ]
+                exported += len(chunk)
+
+            self.logger.info(f"Exported {exported} aliases for user {user_id}")
+
+        except Exception as e:
+            self.logger.error(f"Failed to export aliases for user {user_id} after {exported} rows: {str(e)}")
+            raise
+
     async def deactivate_alias_by_short_code(self, short_code: str, user_id: int) -> Optional[Alias]:
         """Deactivate an alias by short code if it belongs to the user."""
         self.logger.info(f"Deactivating alias with short code {short_code} for user {user_id}")
@@ -80,6 +195,7 @@ class AliasService:
 
             update_data = AliasRepoUpdate(is_enabled=False)
             updated_alias = await self.alias_repository.update(db_obj=alias, obj_in=update_data)
+            self.resolution_cache.invalidate(short_code)
             self.logger.info(f"Successfully deactivated alias with short code {short_code}")
             return updated_alias
 
@@ -89,38 +205,64 @@ class AliasService:
 
     async def get_target_url_by_short_code(self, short_code: str) -> Optional[str]:
         """Get target URL for a short code if the alias is active."""
-        self.logger.debug(f"Looking up target URL for short code: {short_code}")
+        self.logger.debug("Looking up target URL for short code: %s", short_code)
 
         alias = await self.get_active_alias_by_short_code(short_code)
         if not alias:
             return None
 
-        self.logger.info(f"Successfully resolved short code {short_code} to URL: {alias.target_url}")
+        self.logger.info("Successfully resolved short code %s to URL: %s", short_code, alias.target_url)
         return alias.target_url
 
-    async def get_active_alias_by_short_code(self, short_code: str) -> Optional[Alias]:
-        """Get active alias by short code for statistics collection."""
-        self.logger.debug(f"Looking up active alias for short code: {short_code}")
+    async def get_active_alias_by_short_code(self, short_code: str) -> Optional[ResolvedAlias]:
+        """Get active alias by short code, served from the resolution cache when possible."""
+        self.logger.debug("Looking up active alias for short code: %s", short_code)
 
         try:
-            alias = await self.alias_repository.get_by_short_code(short_code)
-            if not alias:
-                self.logger.warning(f"No alias found for short code: {short_code}")
-                return None
+            alias = self.resolution_cache.get(short_code)
+            if alias is None:
+                alias_id = short_code_to_alias_id(short_code)
+                if alias_id is None:
+                    self.logger.warning("Rejected malformed short code: %s", short_code)
+                    return None
+
+                if not self.short_code_filter.might_contain(short_code):
+                    self.logger.warning("Short code %s is not in the short code filter", short_code)
+                    return None
+
+                read_repository = self.alias_read_repository
+                on_replica = bool(self.read_session.info.get("replica"))
+                if on_replica and self.resolution_cache.invalidated_recently(short_code):
+                    # Changed by this process a moment ago; the replica may still have the old row.
+                    self.logger.debug("Short code %s was just invalidated, reading from the primary", short_code)
+                    read_repository, on_replica = self.alias_repository, False
+
+                alias_model = await read_repository.get_by_id_and_short_code(alias_id, short_code)
+                if not alias_model and on_replica:
+                    # The replica may not have replayed a just-created alias yet. Codes that were
+                    # never created are mostly stopped by the short code filter before this point.
+                    self.logger.debug("Short code %s not on the replica, reading from the primary", short_code)
+                    alias_model = await self.alias_repository.get_by_id_and_short_code(alias_id, short_code)
+                if not alias_model:
+                    self.logger.warning("No alias found for short code: %s", short_code)
+                    return None
+
+                alias = ResolvedAlias.from_model(alias_model)
+                self.resolution_cache.set(short_code, alias)
 
             if not alias.is_enabled:
-                self.logger.warning(f"Alias {alias.id} is disabled for short code: {short_code}")
+                self.logger.warning("Alias %s is disabled for short code: %s", alias.id, short_code)
                 return None
 
             if alias.expires_at and alias.expires_at < datetime.now(timezone.utc):
-                self.logger.warning(f"Alias {alias.id} has expired for short code: {short_code}")
+                self.logger.warning("Alias %s has expired for short code: %s", alias.id, short_code)
                 return None
 
-            self.logger.info(f"Successfully found active alias {alias.id} for short code: {short_code}")
+            self.logger.info("Successfully found active alias %s for short code: %s", alias.id, short_code)
             return alias
 
         except Exception as e:
-            self.logger.error(f"Error looking up alias for short code {short_code}: {str(e)}")
+            self.logger.error("Error looking up alias for short code %s: %s", short_code, e)
             raise
 
     @staticmethod
@@ -0,0 +1,174 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+import asyncpg
+from sqlalchemy import String, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from url_alias.db.database import async_session_factory
+from url_alias.db.instrumentation import track_operation
+from url_alias.domains.aliases.constants import ALIAS_CREATED_CHANNEL, MAX_SHORT_CODE_LENGTH
+from url_alias.domains.aliases.repository import AliasRepository
+from url_alias.shared.background import PeriodicTask
+from url_alias.shared.bloom import BloomFilter
+from url_alias.shared.config import get_config
+from url_alias.shared.logging import get_service_logger
+
+config = get_config()
+
+# NOTIFY payloads are limited to 8000 bytes; codes are space separated.
+CODES_PER_NOTIFICATION = 7900 // (MAX_SHORT_CODE_LENGTH + 1)
+# Size rebuilt filters for this many times the current row estimate, so they can absorb growth.
+CAPACITY_HEADROOM = 2
+MIN_CAPACITY = 100_000
+REBUILD_RETRY_SECONDS = 30.0
+
+
+def notification_payloads(short_codes: List[str]) -> List[str]:
+    """Pack codes into as few ALIAS_CREATED_CHANNEL payloads as fit the NOTIFY size limit."""
+    payloads = []
+    for start in range(0, len(short_codes), CODES_PER_NOTIFICATION):
+        end = start + CODES_PER_NOTIFICATION
+        payloads.append(" ".join(short_codes[start:end]))
+    return payloads
+
+
+class ShortCodeFilter:
+    """
+    Negative-lookup filter over the short codes of active aliases.
+
+    A code that is not in the Bloom filter definitely does not resolve, so the redirect
+    can answer 404 without touching the database. The filter is built in the background
+    from the ``aliases`` table at startup and rebuilt every ``rebuild_interval_seconds``;
+    until a build has finished every code is treated as possibly present.
+
+    New codes reach every worker through Postgres NOTIFY on ALIAS_CREATED_CHANNEL. The
+    notification is sent inside the creating transaction and delivered on commit. If the
+    listening connection drops, notifications may have been missed, so the filter is
+    disabled until the next rebuild.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        false_positive_rate: float,
+        max_memory_bytes: int,
+        rebuild_interval_seconds: float,
+        dsn: str = config.db.asyncpg_dsn,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ):
+        self.enabled = enabled
+        self.false_positive_rate = false_positive_rate
+        self.max_memory_bytes = max_memory_bytes
+        self.dsn = dsn
+        self.session_factory = session_factory
+        self.logger = get_service_logger("aliases.short_code_filter")
+        self._filter: Optional[BloomFilter] = None
+        self._building: Optional[BloomFilter] = None
+        self._listener: Optional[asyncpg.Connection] = None
+        self._rebuild_lock = asyncio.Lock()
+        self._rebuild_task = PeriodicTask("short-code-filter-rebuild", self.rebuild, rebuild_interval_seconds)
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def might_contain(self, short_code: str) -> bool:
+        """False only if the code is certainly not an active alias."""
+        if self._filter is None:
+            return True
+        return short_code in self._filter
+
+    def add(self, short_codes: Iterable[str]) -> None:
+        short_codes = list(short_codes)
+        for bloom in (self._filter, self._building):
+            if bloom is not None:
+                bloom.update(short_codes)
+
+        if self._filter is not None and self._filter.count > self._filter.capacity:
+            self._rebuild_task.trigger()
+
+    @track_operation("ShortCodeFilter.publish")
+    async def publish(self, session: AsyncSession, short_codes: List[str]) -> None:
+        """Announce newly created codes to all workers once the session's transaction commits."""
+        if not self.enabled or not short_codes:
+            return
+
+        self.add(short_codes)
+
+        payloads = notification_payloads(short_codes)
+        payload = func.unnest(bindparam("payloads", type_=ARRAY(String))).table_valued("payload").render_derived()
+        statement = select(func.pg_notify(ALIAS_CREATED_CHANNEL, payload.c.payload)).select_from(payload)
+        await session.execute(statement, {"payloads": payloads})
+
+    async def rebuild(self) -> None:
+        """Build a fresh filter from the database and swap it in. Requests are served meanwhile."""
+        async with self._rebuild_lock:
+            try:
+                await self._ensure_listener()
+
+                async with self.session_factory() as session:
+                    alias_repository = AliasRepository(session=session)
+                    estimate = await alias_repository.estimate_count()
+                    self._building = BloomFilter.for_capacity(
+                        capacity=max(estimate * CAPACITY_HEADROOM, MIN_CAPACITY),
+                        false_positive_rate=self.false_positive_rate,
+                        max_memory_bytes=self.max_memory_bytes,
+                    )
+                    async for chunk in alias_repository.stream_active_short_codes(now=datetime.now(timezone.utc)):
+                        self._building.update(chunk)
+
+                self._filter, self._building = self._building, None
+
+            except Exception as e:
+                self._building = None
+                self.logger.error(f"Failed to rebuild short code filter: {str(e)}")
+                asyncio.get_running_loop().call_later(REBUILD_RETRY_SECONDS, self._rebuild_task.trigger)
+                return
+
+        self.logger.info(
+            f"Rebuilt short code filter with {self._filter.count} codes, "
+            f"{self._filter.memory_bytes} bytes, {self._filter.hash_count} hashes, "
+            f"expected false positive rate {round(self._filter.expected_false_positive_rate, 4)}"
+        )
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self._rebuild_task.start()
+        self._rebuild_task.trigger()
+
+    async def stop(self) -> None:
+        await self._rebuild_task.stop()
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            await listener.close()
+
+    async def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.is_closed():
+            return
+
+        self._listener = await asyncpg.connect(self.dsn)
+        self._listener.add_termination_listener(self._on_listener_lost)
+        await self._listener.add_listener(ALIAS_CREATED_CHANNEL, self._on_notification)
+
+    def _on_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        self.add(payload.split())
+
+    def _on_listener_lost(self, connection: asyncpg.Connection) -> None:
+        if self._listener is not connection:
+            return
+        self.logger.warning("Lost short code notification listener, disabling filter until rebuilt")
+        self._listener = None
+        self._filter = None
+        self._rebuild_task.trigger()
+
+
+short_code_filter = ShortCodeFilter(
+    enabled=config.short_code_filter.SHORT_CODE_FILTER_ENABLED,
+    false_positive_rate=config.short_code_filter.SHORT_CODE_FILTER_FALSE_POSITIVE_RATE,
+    max_memory_bytes=int(config.short_code_filter.SHORT_CODE_FILTER_MAX_MEMORY_MB * 1024 * 1024),
+    rebuild_interval_seconds=config.short_code_filter.SHORT_CODE_FILTER_REBUILD_INTERVAL_SECONDS,
+)
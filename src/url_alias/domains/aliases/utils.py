@@ -1,3 +1,7 @@
+from typing import Optional
+
+from url_alias.domains.aliases.constants import MAX_SHORT_CODE_LENGTH, MIN_SHORT_CODE_LENGTH
+
 BASE62_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
 LCG_MULTIPLIER = 6364136223846793005
@@ -5,6 +9,9 @@ LCG_INCREMENT = 1442695040888963407
 LCG_MODULUS = 2**63
 LCG_INVERSE = 4654452103859546277
 
+# aliases.id is a 32-bit INTEGER column
+MAX_ALIAS_ID = 2**31 - 1
+
 
 def encode_base62(number: int) -> str:
     if number < 0:
@@ -45,7 +52,27 @@ def generate_short_code_from_id(alias_id: int) -> str:
     return encode_base62(scrambled)
 
 
-def decode_short_code_to_id(short_code: str) -> int:
-    scrambled = decode_base62(short_code)
-    original_id = (LCG_INVERSE * (scrambled - LCG_INCREMENT)) % LCG_MODULUS
-    return original_id
+def short_code_to_alias_id(short_code: str) -> Optional[int]:
+    """
+    Decode a short code to the alias id it was generated from.
+
+    Returns None for any code generate_short_code_from_id could not have produced:
+    wrong length, characters outside BASE62_ALPHABET, values outside the LCG range,
+    non-canonical spellings (leading zeros) and ids outside the aliases.id range.
+    """
+    if not MIN_SHORT_CODE_LENGTH <= len(short_code) <= MAX_SHORT_CODE_LENGTH:
+        return None
+
+    try:
+        scrambled = decode_base62(short_code)
+    except ValueError:
+        return None
+
+    if scrambled >= LCG_MODULUS or encode_base62(scrambled) != short_code:
+        return None
+
+    alias_id = (LCG_INVERSE * (scrambled - LCG_INCREMENT)) % LCG_MODULUS
+    if alias_id > MAX_ALIAS_ID:
+        return None
+
+    return alias_id
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from url_alias.db.database import async_session_factory
+from url_alias.domains.statistics.repository import ClickKey, PendingClicks, StatisticRepository, minute_bucket
+from url_alias.shared.background import PeriodicTask
+from url_alias.shared.config import get_config
+from url_alias.shared.logging import get_service_logger
+from url_alias.shared.prometheus import Counter
+
+config = get_config()
+
+clicks_recorded = Counter("url_alias_clicks_recorded", "Redirect clicks buffered for writing.")
+clicks_written = Counter("url_alias_clicks_written", "Buffered clicks written to the database.")
+click_flushes = Counter("url_alias_click_flushes", "Click buffer flushes, by result.", ["result"])
+
+
+class ClickAggregator:
+    """
+    Write-behind buffer for redirect clicks.
+
+    Clicks are counted in memory per (alias_id, minute) and written to the minute
+    buckets and ``alias_statistics`` by a background flush, either every
+    ``flush_interval_seconds`` or as soon as ``max_pending`` keys are buffered.
+    Each process owns its own buffer; flushes from several workers are additive
+    and therefore safe to interleave.
+    """
+
+    def __init__(
+        self,
+        flush_interval_seconds: float,
+        max_pending: int,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ):
+        self.max_pending = max_pending
+        self.session_factory = session_factory
+        self.logger = get_service_logger("statistics.aggregator")
+        self._pending: dict[ClickKey, PendingClicks] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = PeriodicTask("click-aggregator-flush", self.flush, flush_interval_seconds)
+
+    @property
+    def pending_keys(self) -> int:
+        return len(self._pending)
+
+    def record(self, alias_id: int, clicked_at: Optional[datetime] = None) -> None:
+        """Buffer a single click. Never touches the database."""
+        clicked_at = clicked_at or datetime.now(timezone.utc)
+        key = (alias_id, minute_bucket(clicked_at))
+        clicks_recorded.inc()
+
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = PendingClicks(count=1, last_clicked_at=clicked_at)
+            if len(self._pending) >= self.max_pending:
+                self._flush_task.trigger()
+        else:
+            pending.count += 1
+            if clicked_at > pending.last_clicked_at:
+                pending.last_clicked_at = clicked_at
+
+    async def flush(self) -> int:
+        """Write all buffered clicks in one statement. Returns the number of clicks written."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            clicks = sum(pending.count for pending in batch.values())
+
+            try:
+                async with self.session_factory() as session:
+                    await StatisticRepository(session=session).add_clicks(batch)
+                    await session.commit()
+            except Exception as e:
+                self._requeue(batch)
+                click_flushes.labels("error").inc()
+                self.logger.error(f"Failed to flush {clicks} clicks in {len(batch)} buckets: {str(e)}")
+                raise
+
+            click_flushes.labels("ok").inc()
+            clicks_written.inc(clicks)
+            self.logger.debug(f"Flushed {clicks} clicks in {len(batch)} buckets")
+            return clicks
+
+    def start(self) -> None:
+        self._flush_task.start()
+
+    async def stop(self) -> None:
+        """Stop the background flush and drain whatever is still buffered."""
+        # A flush in progress has already taken its batch out of the buffer, so it must
+        # finish: cancelled, its clicks would be in neither the buffer nor the database.
+        await self._flush_task.stop(wait=True)
+        try:
+            await self.flush()
+        except Exception:
+            self.logger.error(f"Dropping {len(self._pending)} buffered click buckets on shutdown")
+
+    def _requeue(self, batch: dict[ClickKey, PendingClicks]) -> None:
+        """Merge a failed batch back so the clicks are retried on the next flush."""
+        for key, failed in batch.items():
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = failed
+            else:
+                pending.count += failed.count
+                pending.last_clicked_at = max(pending.last_clicked_at, failed.last_clicked_at)
+
+
+click_aggregator = ClickAggregator(
+    flush_interval_seconds=config.clicks.CLICK_FLUSH_INTERVAL_SECONDS,
+    max_pending=config.clicks.CLICK_FLUSH_MAX_PENDING,
+)
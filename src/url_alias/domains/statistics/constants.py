@@ -0,0 +1 @@
+STATISTIC_EXPORT_FIELDS = ("short_url", "target_url", "last_hour_clicks", "last_day_clicks", "total_clicks")
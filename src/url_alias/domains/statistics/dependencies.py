@@ -1,9 +1,11 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from url_alias.db.database import get_session
+from url_alias.db.database import get_read_session, get_session
 from url_alias.domains.statistics.services import StatisticService
 
 
-def get_statistic_service(session: AsyncSession = Depends(get_session)) -> StatisticService:
-    return StatisticService(session=session)
+def get_statistic_service(
+    session: AsyncSession = Depends(get_session), read_session: AsyncSession = Depends(get_read_session)
+) -> StatisticService:
+    return StatisticService(session=session, read_session=read_session)
@@ -1,21 +1,69 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from url_alias.db.database import Base
 from url_alias.db.model import BaseModel
 
 
 class AliasStatistic(BaseModel):
+    """
+    Click totals per alias. Every alias gets a row with zero clicks when it is created,
+    so listings by clicks can read this table alone.
+    """
+
     __tablename__ = "alias_statistics"
 
     alias_id: Mapped[int] = mapped_column(Integer, ForeignKey("aliases.id"), nullable=False, unique=True, index=True)
+    # Copy of aliases.user_id, so a user's leaderboard is a range of the index below.
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     total_clicks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    last_hour_clicks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    last_day_clicks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    last_hour_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    last_day_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     last_clicked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     alias = relationship("Alias", back_populates="statistics")
+
+
+# Per-user leaderboard by total clicks; scanned backwards for ascending order.
+Index(
+    "ix_alias_statistics_user_id_total_clicks",
+    AliasStatistic.user_id,
+    AliasStatistic.total_clicks.desc(),
+    AliasStatistic.alias_id.desc(),
+)
+
+
+class ArchivedAliasStatistic(Base):
+    """Click totals of aliases moved to ``archived_aliases``. Per-minute and hourly buckets are not kept."""
+
+    __tablename__ = "archived_alias_statistics"
+
+    alias_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    total_clicks: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_clicked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class AliasClickBucket(Base):
+    """Clicks per alias per minute. Rolled up into hourly buckets once older than the retention window."""
+
+    __tablename__ = "alias_click_buckets"
+    __table_args__ = (Index("ix_alias_click_buckets_bucket_start", "bucket_start", postgresql_using="brin"),)
+
+    alias_id: Mapped[int] = mapped_column(Integer, ForeignKey("aliases.id"), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    clicks: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class AliasClickHourlyBucket(Base):
+    """Clicks per alias per hour, produced by compacting minute buckets."""
+
+    __tablename__ = "alias_click_hourly_buckets"
+
+    alias_id: Mapped[int] = mapped_column(Integer, ForeignKey("aliases.id"), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    clicks: Mapped[int] = mapped_column(Integer, nullable=False)
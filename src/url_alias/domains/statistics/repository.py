@@ -1,34 +1,57 @@
-from datetime import datetime
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Mapping, Optional, Sequence
 
-from sqlalchemy import asc, desc, select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Row,
+    asc,
+    bindparam,
+    delete,
+    desc,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from url_alias.db.repository import BaseRepository
 from url_alias.db.schema import AppBaseSchema
 from url_alias.domains.aliases.models import Alias
-from url_alias.domains.statistics.models import AliasStatistic
+from url_alias.domains.statistics.models import AliasClickBucket, AliasClickHourlyBucket, AliasStatistic
+
+ClickKey = tuple[int, datetime]
+"""(alias_id, minute bucket start)"""
 
 
 class StatisticRepoCreate(AppBaseSchema):
     alias_id: int
     total_clicks: int = 0
-    last_hour_clicks: int = 0
-    last_day_clicks: int = 0
-    last_hour_updated_at: Optional[datetime] = None
-    last_day_updated_at: Optional[datetime] = None
     last_clicked_at: Optional[datetime] = None
 
 
 class StatisticRepoUpdate(AppBaseSchema):
     total_clicks: Optional[int] = None
-    last_hour_clicks: Optional[int] = None
-    last_day_clicks: Optional[int] = None
-    last_hour_updated_at: Optional[datetime] = None
-    last_day_updated_at: Optional[datetime] = None
     last_clicked_at: Optional[datetime] = None
 
 
+@dataclass(slots=True)
+class PendingClicks:
+    count: int
+    last_clicked_at: datetime
+
+
+def minute_bucket(moment: datetime) -> datetime:
+    """Start of the minute bucket a moment falls into."""
+    return moment.replace(second=0, microsecond=0)
+
+
 class StatisticRepository(BaseRepository[AliasStatistic, StatisticRepoCreate, StatisticRepoUpdate]):
     def __init__(self, session: AsyncSession):
         super().__init__(model=AliasStatistic, session=session)
@@ -39,25 +62,259 @@ class StatisticRepository(BaseRepository[AliasStatistic, StatisticRepoCreate, St
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_statistics_summary(self, user_id: int, sort_order: str = "desc", limit: int = 100, offset: int = 0):
-        """Get aggregated statistics for user's aliases with pagination."""
+    async def create_for_aliases(self, aliases: Sequence[Alias]) -> None:
+        """Create the zero-click rows for newly inserted aliases, so they show up in the leaderboard."""
+        if not aliases:
+            return
+
+        incoming = (
+            func.unnest(
+                bindparam("alias_ids", [alias.id for alias in aliases], type_=ARRAY(Integer)),
+                bindparam("user_ids", [alias.user_id for alias in aliases], type_=ARRAY(Integer)),
+            )
+            .table_valued("alias_id", "user_id")
+            .render_derived()
+        )
+        statement = (
+            pg_insert(self.model)
+            .from_select(
+                [self.model.alias_id, self.model.user_id, self.model.total_clicks],
+                select(incoming.c.alias_id, incoming.c.user_id, literal(0)),
+            )
+            .on_conflict_do_nothing(index_elements=[self.model.alias_id])
+        )
+        await self.session.execute(statement)
+
+    async def add_clicks(self, clicks: Mapping[ClickKey, PendingClicks]) -> None:
+        """
+        Apply buffered clicks: one upsert into the minute buckets and one into the per-alias totals.
+
+        Rows are written in key order so concurrent flushes from several workers
+        always take row locks in the same order. Clicks for aliases that no longer
+        exist are dropped by the join.
+        """
+        if not clicks:
+            return
+
+        await self._upsert_minute_buckets(clicks)
+        await self._upsert_totals(clicks)
+
+    async def _upsert_minute_buckets(self, clicks: Mapping[ClickKey, PendingClicks]) -> None:
+        keys = sorted(clicks)
+        bucket = AliasClickBucket
+        # Values are bound on the parameters themselves: passing them to execute() would make
+        # the ORM treat the statement as a bulk insert keyed by parameter name.
+        incoming = (
+            func.unnest(
+                bindparam("alias_ids", [alias_id for alias_id, _ in keys], type_=ARRAY(Integer)),
+                bindparam(
+                    "bucket_starts", [bucket_start for _, bucket_start in keys], type_=ARRAY(DateTime(timezone=True))
+                ),
+                bindparam("counts", [clicks[key].count for key in keys], type_=ARRAY(Integer)),
+            )
+            .table_valued("alias_id", "bucket_start", "clicks")
+            .render_derived()
+        )
+        source = (
+            select(incoming.c.alias_id, incoming.c.bucket_start, incoming.c.clicks)
+            .join(Alias, Alias.id == incoming.c.alias_id)
+            .order_by(incoming.c.alias_id, incoming.c.bucket_start)
+        )
+        statement = pg_insert(bucket).from_select([bucket.alias_id, bucket.bucket_start, bucket.clicks], source)
+        statement = statement.on_conflict_do_update(
+            index_elements=[bucket.alias_id, bucket.bucket_start],
+            set_={"clicks": bucket.clicks + statement.excluded.clicks},
+        )
+
+        await self.session.execute(statement)
+
+    async def _upsert_totals(self, clicks: Mapping[ClickKey, PendingClicks]) -> None:
+        totals: dict[int, PendingClicks] = {}
+        for (alias_id, _), pending in clicks.items():
+            total = totals.get(alias_id)
+            if total is None:
+                totals[alias_id] = PendingClicks(count=pending.count, last_clicked_at=pending.last_clicked_at)
+            else:
+                total.count += pending.count
+                total.last_clicked_at = max(total.last_clicked_at, pending.last_clicked_at)
+
+        alias_ids = sorted(totals)
+        incoming = (
+            func.unnest(
+                bindparam("alias_ids", alias_ids, type_=ARRAY(Integer)),
+                bindparam("counts", [totals[alias_id].count for alias_id in alias_ids], type_=ARRAY(Integer)),
+                bindparam(
+                    "clicked_at",
+                    [totals[alias_id].last_clicked_at for alias_id in alias_ids],
+                    type_=ARRAY(DateTime(timezone=True)),
+                ),
+            )
+            .table_valued("alias_id", "clicks", "last_clicked_at")
+            .render_derived()
+        )
+        source = (
+            select(incoming.c.alias_id, Alias.user_id, incoming.c.clicks, incoming.c.last_clicked_at)
+            .join(Alias, Alias.id == incoming.c.alias_id)
+            .order_by(incoming.c.alias_id)
+        )
+        statement = pg_insert(self.model).from_select(
+            [self.model.alias_id, self.model.user_id, self.model.total_clicks, self.model.last_clicked_at], source
+        )
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.model.alias_id],
+            set_={
+                "total_clicks": self.model.total_clicks + excluded.total_clicks,
+                "last_clicked_at": func.greatest(self.model.last_clicked_at, excluded.last_clicked_at),
+                "updated_at": func.now(),
+            },
+        )
+
+        await self.session.execute(statement)
+
+    async def compact_click_buckets(self, older_than: datetime) -> int:
+        """
+        Move minute buckets older than ``older_than`` into hourly buckets.
+
+        The delete and the hourly upsert run as one statement, so a failed compaction
+        never loses or double-counts clicks. Returns the number of hourly rows touched.
+        """
+        minute, hourly = AliasClickBucket, AliasClickHourlyBucket
+
+        moved = (
+            delete(minute)
+            .where(minute.bucket_start < older_than)
+            .returning(minute.alias_id, minute.bucket_start, minute.clicks)
+            .cte("moved")
+        )
+        hour_start = func.date_trunc(literal_column("'hour'"), moved.c.bucket_start)
+        source = (
+            select(moved.c.alias_id, hour_start, func.sum(moved.c.clicks))
+            .group_by(moved.c.alias_id, hour_start)
+            .order_by(moved.c.alias_id, hour_start)
+        )
+        statement = pg_insert(hourly).from_select([hourly.alias_id, hourly.bucket_start, hourly.clicks], source)
+        statement = statement.on_conflict_do_update(
+            index_elements=[hourly.alias_id, hourly.bucket_start],
+            set_={"clicks": hourly.clicks + statement.excluded.clicks},
+        )
+
+        result = await self.session.execute(statement)
+        return result.rowcount
+
+    async def get_statistics_summary(
+        self,
+        user_id: int,
+        now: datetime,
+        sort_order: str = "desc",
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[tuple[int, int]] = None,
+    ):
+        """
+        Get aggregated statistics for user's aliases with pagination.
+
+        Rows are ordered by (total_clicks, alias_id) in ``sort_order``. ``after`` is that key
+        for the last row of the previous page; when given, the page starts right after it
+        instead of skipping ``offset`` rows.
+
+        The page is a range read of the (user_id, total_clicks, alias_id) leaderboard index,
+        forwards for descending order and backwards for ascending, so its cost does not
+        depend on how many aliases the user has.
+
+        Hour and day counts are sliding windows over the minute buckets: the last 60 and
+        1440 minute buckets, including the current one. They are computed per row of the
+        page through a lateral subquery that reads a (alias_id, bucket_start) index range.
+        """
         order_func = desc if sort_order == "desc" else asc
+        current_minute = minute_bucket(now)
+        hour_start = current_minute - timedelta(minutes=59)
+        day_start = current_minute - timedelta(minutes=24 * 60 - 1)
+
+        statistic = AliasStatistic
+        page = (
+            select(statistic.alias_id, statistic.total_clicks)
+            .where(statistic.user_id == user_id)
+            .order_by(order_func(statistic.total_clicks), order_func(statistic.alias_id))
+            .limit(limit)
+            .offset(offset)
+        )
+        if after is not None:
+            sort_key = tuple_(statistic.total_clicks, statistic.alias_id)
+            page = page.where(sort_key < tuple_(*after) if sort_order == "desc" else sort_key > tuple_(*after))
+        page = page.subquery("page")
+
+        bucket = AliasClickBucket
+        windows = (
+            select(
+                func.coalesce(func.sum(bucket.clicks).filter(bucket.bucket_start >= hour_start), 0).label(
+                    "last_hour_clicks"
+                ),
+                func.coalesce(func.sum(bucket.clicks), 0).label("last_day_clicks"),
+            )
+            .where(bucket.alias_id == page.c.alias_id, bucket.bucket_start >= day_start)
+            .lateral("windows")
+        )
 
         statement = (
             select(
+                page.c.alias_id,
                 Alias.short_code,
                 Alias.target_url,
-                AliasStatistic.total_clicks,
-                AliasStatistic.last_hour_clicks,
-                AliasStatistic.last_day_clicks,
-            )
-            .select_from(Alias)
-            .outerjoin(AliasStatistic, Alias.id == AliasStatistic.alias_id)
-            .where(Alias.short_code.isnot(None), Alias.user_id == user_id)
-            .order_by(order_func(AliasStatistic.total_clicks))
-            .limit(limit)
-            .offset(offset)
+                page.c.total_clicks,
+                windows.c.last_hour_clicks,
+                windows.c.last_day_clicks,
+            )
+            .select_from(page.join(Alias, Alias.id == page.c.alias_id).join(windows, true()))
+            .order_by(order_func(page.c.total_clicks), order_func(page.c.alias_id))
         )
 
         result = await self.session.execute(statement)
         return result.all()
+
+    async def stream_statistics(
+        self, user_id: int, now: datetime, chunk_size: int = 1_000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yield statistics for all of a user's aliases in leaderboard order, in chunks through
+        a server-side cursor.
+
+        Unlike the paged summary, the sliding windows are aggregated once for all of the
+        user's buckets of the last day and hash joined, instead of one lateral lookup per row.
+        """
+        current_minute = minute_bucket(now)
+        hour_start = current_minute - timedelta(minutes=59)
+        day_start = current_minute - timedelta(minutes=24 * 60 - 1)
+
+        statistic, bucket = AliasStatistic, AliasClickBucket
+        windows = (
+            select(
+                bucket.alias_id,
+                func.sum(bucket.clicks).filter(bucket.bucket_start >= hour_start).label("last_hour_clicks"),
+                func.sum(bucket.clicks).label("last_day_clicks"),
+            )
+            .join(statistic, statistic.alias_id == bucket.alias_id)
+            .where(statistic.user_id == user_id, bucket.bucket_start >= day_start)
+            .group_by(bucket.alias_id)
+            .subquery("windows")
+        )
+
+        statement = (
+            select(
+                statistic.alias_id,
+                Alias.short_code,
+                Alias.target_url,
+                statistic.total_clicks,
+                func.coalesce(windows.c.last_hour_clicks, 0).label("last_hour_clicks"),
+                func.coalesce(windows.c.last_day_clicks, 0).label("last_day_clicks"),
+            )
+            .join(Alias, Alias.id == statistic.alias_id)
+            .outerjoin(windows, windows.c.alias_id == statistic.alias_id)
+            .where(statistic.user_id == user_id)
+            .order_by(statistic.total_clicks.desc(), statistic.alias_id.desc())
+            .execution_options(yield_per=chunk_size)
+        )
+
+        result = await self.session.stream(statement)
+        async for chunk in result.partitions():
+            yield chunk
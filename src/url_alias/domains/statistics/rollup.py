@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from url_alias.db.database import async_session_factory
+from url_alias.domains.statistics.repository import StatisticRepository, minute_bucket
+from url_alias.shared.background import PeriodicTask
+from url_alias.shared.config import get_config
+from url_alias.shared.logging import get_service_logger
+
+config = get_config()
+
+
+class ClickBucketRollup:
+    """
+    Periodically compacts minute click buckets older than the retention window into hourly buckets.
+
+    Safe to run from several workers at once: each minute bucket row can only be deleted,
+    and therefore rolled up, by one of them.
+    """
+
+    def __init__(
+        self,
+        retention_hours: int,
+        interval_seconds: float,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ):
+        self.retention = timedelta(hours=retention_hours)
+        self.session_factory = session_factory
+        self.logger = get_service_logger("statistics.rollup")
+        self._task = PeriodicTask("click-bucket-rollup", self.run_once, interval_seconds)
+
+    async def run_once(self) -> int:
+        cutoff = minute_bucket(datetime.now(timezone.utc)) - self.retention
+
+        async with self.session_factory() as session:
+            hourly_rows = await StatisticRepository(session=session).compact_click_buckets(older_than=cutoff)
+            await session.commit()
+
+        self.logger.info(f"Rolled up minute buckets older than {cutoff.isoformat()} into {hourly_rows} hourly rows")
+        return hourly_rows
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def stop(self) -> None:
+        await self._task.stop()
+
+
+click_bucket_rollup = ClickBucketRollup(
+    retention_hours=config.clicks.CLICK_MINUTE_BUCKET_RETENTION_HOURS,
+    interval_seconds=config.clicks.CLICK_ROLLUP_INTERVAL_SECONDS,
+)
@@ -1,12 +1,16 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
+from url_alias.domains.statistics.constants import STATISTIC_EXPORT_FIELDS
 from url_alias.domains.statistics.dependencies import get_statistic_service
 from url_alias.domains.statistics.schemas import SortOrder, StatisticSummary
 from url_alias.domains.statistics.services import StatisticService
 from url_alias.domains.users.dependencies import get_current_active_user
 from url_alias.domains.users.models import User as UserModel
+from url_alias.shared.export import ExportFormat, export_response
+from url_alias.shared.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from url_alias.shared.responses import RowsJSONResponse
 
 router = APIRouter(
     prefix="/statistics",
@@ -14,29 +18,60 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=List[StatisticSummary])
+@router.get("", response_model=List[StatisticSummary], response_class=RowsJSONResponse)
 async def get_statistics_summary(
     request: Request,
     statistic_service: StatisticService = Depends(get_statistic_service),
     current_user: UserModel = Depends(get_current_active_user),
     sort_order: SortOrder = SortOrder.DESC,
-    page: int = Query(default=1, ge=1, description="Page number (starts from 1)"),
+    page: int = Query(default=1, ge=1, description="Page number (starts from 1). Ignored when cursor is set"),
     page_size: int = Query(default=20, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(default=None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
 ):
     """
     Get aggregated statistics for user's aliases sorted by total clicks with pagination.
-    Requires Basic Auth.
+    Requires Basic Auth. If there are more aliases, the cursor for the next page is returned
+    in the X-Next-Cursor header; a cursor is only valid with the sort_order it was issued for.
     """
     try:
         base_url = str(request.base_url).rstrip("/")
         offset = (page - 1) * page_size
 
-        statistics = await statistic_service.get_statistics_summary(
-            user_id=current_user.id, base_url=base_url, sort_order=sort_order.value, limit=page_size, offset=offset
+        statistics_page = await statistic_service.get_statistics_summary(
+            user_id=current_user.id,
+            base_url=base_url,
+            sort_order=sort_order.value,
+            limit=page_size,
+            offset=offset,
+            cursor=cursor,
         )
-        return statistics
+        headers = {NEXT_CURSOR_HEADER: statistics_page.next_cursor} if statistics_page.next_cursor else None
+        return RowsJSONResponse(statistics_page.items, headers=headers)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while retrieving statistics.",
         )
+
+
+@router.get("/export")
+async def export_statistics(
+    request: Request,
+    current_user: UserModel = Depends(get_current_active_user),
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format", description="ndjson or csv"),
+):
+    """
+    Download statistics for all of the user's aliases, most clicked first, as NDJSON or CSV.
+    Requires Basic Auth. Rows are streamed from a server-side cursor.
+    """
+    base_url = str(request.base_url).rstrip("/")
+    user_id = current_user.id
+
+    return export_response(
+        lambda session: StatisticService(session=session).export_statistics(user_id=user_id, base_url=base_url),
+        export_format=export_format,
+        fields=STATISTIC_EXPORT_FIELDS,
+        filename="statistics",
+    )
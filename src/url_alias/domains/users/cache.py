@@ -0,0 +1,101 @@
+import hashlib
+import hmac
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from url_alias.domains.users.models import User
+from url_alias.shared.config import get_config
+
+config = get_config()
+
+
+@dataclass(frozen=True, slots=True)
+class VerifiedCredential:
+    """A username/password pair that passed bcrypt verification."""
+
+    user_id: int
+    password_digest: bytes
+    hashed_password: str
+
+
+class CredentialCache:
+    """
+    Bounded LRU cache of credentials that recently passed bcrypt verification.
+
+    Entries are keyed by username and hold an HMAC of the presented password under a
+    per-process random key, so plaintext passwords are never kept and the digests are
+    useless outside this process. Only successful verifications are cached.
+
+    A hit only skips bcrypt; the caller still loads the user row and must check it with
+    ``matches``, which rejects the entry once the user is deactivated or their password
+    hash changes. That makes invalidation immediate across workers without any messaging.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._key = secrets.token_bytes(32)
+        self._entries: OrderedDict[str, tuple[float, VerifiedCredential]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def _digest(self, username: str, password: str) -> bytes:
+        return hmac.new(self._key, f"{username}\0{password}".encode(), hashlib.sha256).digest()
+
+    def get(self, username: str, password: str) -> Optional[VerifiedCredential]:
+        """Return the cached credential if this exact password was verified recently."""
+        entry = self._entries.get(username)
+        if entry is None:
+            return None
+
+        deadline, credential = entry
+        if deadline <= time.monotonic():
+            del self._entries[username]
+            return None
+
+        if not hmac.compare_digest(credential.password_digest, self._digest(username, password)):
+            return None
+
+        self._entries.move_to_end(username)
+        return credential
+
+    def set(self, username: str, password: str, user: User) -> None:
+        """Remember a successful verification, evicting the least recently used entries above max_size."""
+        if not self.enabled:
+            return
+
+        credential = VerifiedCredential(
+            user_id=user.id,
+            password_digest=self._digest(username, password),
+            hashed_password=user.hashed_password,
+        )
+        self._entries[username] = (time.monotonic() + self.ttl_seconds, credential)
+        self._entries.move_to_end(username)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def matches(credential: VerifiedCredential, user: User) -> bool:
+        """True if the current user row is still the one the credential was verified against."""
+        return user.is_active and user.id == credential.user_id and user.hashed_password == credential.hashed_password
+
+    def invalidate(self, username: str) -> None:
+        self._entries.pop(username, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+credential_cache = CredentialCache(
+    max_size=config.auth_cache.AUTH_CACHE_MAX_SIZE,
+    ttl_seconds=config.auth_cache.AUTH_CACHE_TTL_SECONDS,
+)
@@ -4,7 +4,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from url_alias.db.database import get_session
+from url_alias.db.database import get_primary_read_session, get_session
 from url_alias.domains.users.models import User
 from url_alias.domains.users.services import UserService
 from url_alias.shared.logging import get_logger
@@ -13,8 +13,10 @@ security = HTTPBasic()
 logger = get_logger(__name__)
 
 
-def get_user_service(session: AsyncSession = Depends(get_session)) -> UserService:
-    return UserService(session=session)
+def get_user_service(
+    session: AsyncSession = Depends(get_session), read_session: AsyncSession = Depends(get_primary_read_session)
+) -> UserService:
+    return UserService(session=session, read_session=read_session)
 
 
 async def get_current_user(
@@ -25,12 +27,12 @@ async def get_current_user(
     Dependency to get the current authenticated user via Basic Auth.
     Raises HTTPException 401 if credentials are invalid or user not found.
     """
-    logger.debug(f"Basic auth attempt for user: {credentials.username}")
+    logger.debug("Basic auth attempt for user: %s", credentials.username)
 
     user = await user_service.authenticate_user(username=credentials.username, password=credentials.password)
 
     if not user:
-        logger.warning(f"Basic auth failed for user: {credentials.username}")
+        logger.warning("Basic auth failed for user: %s", credentials.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -38,14 +40,14 @@ async def get_current_user(
         )
 
     if not user.is_active:
-        logger.warning(f"User {credentials.username} is inactive")
+        logger.warning("User %s is inactive", credentials.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user",
             headers={"WWW-Authenticate": "Basic"},
         )
 
-    logger.info(f"Successfully authenticated user: {user.username}")
+    logger.info("Successfully authenticated user: %s", user.username)
     return user
 
 
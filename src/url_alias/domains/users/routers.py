@@ -5,7 +5,7 @@ from url_alias.domains.users.models import User as UserModel
 from url_alias.domains.users.schemas import UserCreate, UserRead
 from url_alias.domains.users.services import UserService
 from url_alias.shared.logging import get_logger
-from url_alias.shared.rate_limiting import limiter
+from url_alias.shared.rate_limiting import check_rate_limit, limiter
 
 router = APIRouter(
     prefix="/users",
@@ -15,7 +15,12 @@ router = APIRouter(
 logger = get_logger(__name__)
 
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(check_rate_limit)],
+)
 @limiter.limit("5/hour")
 async def register_user(
     request: Request, user_create: UserCreate, user_service: UserService = Depends(get_user_service)
@@ -1,13 +1,39 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from url_alias.shared.config import get_config
+from url_alias.shared.prometheus import Counter
+
+config = get_config()
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=config.passwords.BCRYPT_ROUNDS)
+
+# bcrypt releases the GIL while hashing, so threads run it in parallel without blocking the event loop.
+# The pool size caps how many CPU cores password work may take away from request handling.
+password_executor = ThreadPoolExecutor(
+    max_workers=config.passwords.PASSWORD_HASHING_MAX_WORKERS, thread_name_prefix="password-hashing"
+)
+
+password_hashing_calls = Counter(
+    "url_alias_password_hashing_calls", "bcrypt calls, by operation (verify or hash).", ["operation"]
+)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a plain password against a hashed password in the password thread pool."""
+    password_hashing_calls.labels("verify").inc()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.verify, plain_password, hashed_password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifies a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+async def get_password_hash(password: str) -> str:
+    """Hashes a plain password in the password thread pool."""
+    password_hashing_calls.labels("hash").inc()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
 
 
-def get_password_hash(password: str) -> str:
-    """Hashes a plain password."""
-    return pwd_context.hash(password)
+def shutdown_password_executor() -> None:
+    password_executor.shutdown(wait=False, cancel_futures=True)
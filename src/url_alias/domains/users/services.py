@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from url_alias.domains.users.cache import credential_cache
 from url_alias.domains.users.models import User
 from url_alias.domains.users.repository import UserRepoCreate, UserRepository
 from url_alias.domains.users.schemas import UserCreate
@@ -10,9 +11,13 @@ from url_alias.shared.logging import get_service_logger
 
 
 class UserService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None):
+        """``read_session`` serves the credential lookup; it must read from the primary."""
         self.session = session
+        self.read_session = read_session or session
         self.user_repository = UserRepository(session=session)
+        self.user_read_repository = UserRepository(session=self.read_session)
+        self.credential_cache = credential_cache
         self.logger = get_service_logger("users")
 
     async def create_user(self, *, user_in: UserCreate) -> User:
@@ -20,7 +25,7 @@ class UserService:
         self.logger.info(f"Creating new user with username: {user_in.username}")
 
         try:
-            hashed_password = get_password_hash(user_in.password)
+            hashed_password = await get_password_hash(user_in.password)
             repo_create_data = UserRepoCreate(
                 username=user_in.username,
                 hashed_password=hashed_password,
@@ -35,26 +40,38 @@ class UserService:
             raise
 
     async def authenticate_user(self, *, username: str, password: str) -> Optional[User]:
-        """Authenticates a user by username and password."""
-        self.logger.debug(f"Attempting to authenticate user: {username}")
+        """
+        Authenticates a user by username and password.
+        Recently verified credentials skip bcrypt as long as the user row is unchanged.
+        """
+        self.logger.debug("Attempting to authenticate user: %s", username)
 
         try:
-            user = await self.user_repository.get_by_username(username=username)
+            user = await self.user_read_repository.get_by_username(username=username)
             if not user:
-                self.logger.warning(f"Authentication failed: user {username} not found")
+                self.logger.warning("Authentication failed: user %s not found", username)
+                self.credential_cache.invalidate(username)
                 return None
             if not user.is_active:
-                self.logger.warning(f"Authentication failed: user {username} is inactive")
+                self.logger.warning("Authentication failed: user %s is inactive", username)
+                self.credential_cache.invalidate(username)
                 return None
-            if not verify_password(plain_password=password, hashed_password=user.hashed_password):
-                self.logger.warning(f"Authentication failed: invalid password for user {username}")
+
+            cached = self.credential_cache.get(username, password)
+            if cached is not None and self.credential_cache.matches(cached, user):
+                self.logger.debug("Authenticated user %s from credential cache", username)
+                return user
+
+            if not await verify_password(plain_password=password, hashed_password=user.hashed_password):
+                self.logger.warning("Authentication failed: invalid password for user %s", username)
                 return None
 
-            self.logger.info(f"Successfully authenticated user: {username}")
+            self.credential_cache.set(username, password, user)
+            self.logger.info("Successfully authenticated user: %s", username)
             return user
 
         except Exception as e:
-            self.logger.error(f"Error during authentication for user {username}: {str(e)}")
+            self.logger.error("Error during authentication for user %s: %s", username, e)
             raise
 
     async def get_all_users(self) -> List[User]:
@@ -2,11 +2,22 @@ from fastapi import FastAPI
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
+from url_alias.api.internal import metrics_router
+from url_alias.api.internal import router as internal_router
+from url_alias.api.middleware import MetricsMiddleware
 from url_alias.api.v1.api import api_router
+from url_alias.api.v1.fast_redirect import FastRedirectMiddleware
 from url_alias.api.v1.public import router as public_router
-from url_alias.shared.logging import get_logger
-from url_alias.shared.rate_limiting import limiter
+from url_alias.domains.aliases.reaper import expired_alias_reaper
+from url_alias.domains.aliases.short_code_filter import short_code_filter
+from url_alias.domains.statistics.aggregator import click_aggregator
+from url_alias.domains.statistics.rollup import click_bucket_rollup
+from url_alias.domains.users.security import shutdown_password_executor
+from url_alias.shared.config import get_config
+from url_alias.shared.logging import LogConfig, get_logger
+from url_alias.shared.rate_limiting import close_limiter_storage, limiter
 
+config = get_config()
 logger = get_logger(__name__)
 
 app = FastAPI(
@@ -18,7 +29,16 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Middleware added last runs first, so metrics also cover redirects served by the fast path.
+if config.aliases.FAST_REDIRECT_ENABLED:
+    app.add_middleware(FastRedirectMiddleware)
+if config.metrics.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
+app.include_router(internal_router)
+if config.metrics.METRICS_ENABLED:
+    app.include_router(metrics_router)
 app.include_router(public_router, tags=["public"])
 
 
@@ -31,8 +51,20 @@ def read_root():
 @app.on_event("startup")
 async def startup_event():
     logger.info("URL Alias Service is starting up...")
+    short_code_filter.start()
+    click_aggregator.start()
+    click_bucket_rollup.start()
+    expired_alias_reaper.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("URL Alias Service is shutting down...")
+    await expired_alias_reaper.stop()
+    await click_bucket_rollup.stop()
+    await click_aggregator.stop()
+    await short_code_filter.stop()
+    shutdown_password_executor()
+    close_limiter_storage()
+    # Worker processes exit without running atexit hooks, so flush queued log records here.
+    LogConfig.stop_logging()
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from url_alias.shared.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs an async callable in the background every ``interval_seconds``.
+
+    ``trigger()`` wakes the loop early, so callers can request an immediate run
+    (e.g. when a buffer fills up) without waiting for the next tick.
+
+    ``stop()`` cancels the loop, including a run in progress; ``stop(wait=True)``
+    lets a run in progress finish and ends the loop after it, for callables that
+    must not be interrupted halfway (e.g. a write whose batch would be lost).
+    """
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[object]], interval_seconds: float):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"Started background task {self.name} (interval: {self.interval_seconds}s)")
+
+    def trigger(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self, wait: bool = False) -> None:
+        if self._task is None:
+            return
+        if wait:
+            self._stopping = True
+            self._wakeup.set()
+        else:
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+        logger.info(f"Stopped background task {self.name}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+
+            try:
+                await self.func()
+            except Exception as e:
+                logger.error(f"Background task {self.name} failed: {str(e)}")
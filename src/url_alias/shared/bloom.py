@@ -0,0 +1,60 @@
+import math
+from hashlib import blake2b
+from typing import Iterable, Iterator
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Uses double hashing of a single 128-bit blake2b digest to derive the bit positions.
+    Membership tests can return false positives but never false negatives.
+    """
+
+    def __init__(self, size_bits: int, hash_count: int, capacity: int):
+        if size_bits < 8 or hash_count < 1:
+            raise ValueError("Bloom filter needs at least 8 bits and 1 hash function")
+
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float, max_memory_bytes: int) -> "BloomFilter":
+        """Size a filter for ``capacity`` items at ``false_positive_rate``, capped at ``max_memory_bytes``."""
+        capacity = max(capacity, 1)
+        size_bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        size_bits = max(8, min(size_bits, max_memory_bytes * 8))
+        hash_count = max(1, round(size_bits / capacity * math.log(2)))
+        return cls(size_bits=size_bits, hash_count=hash_count, capacity=capacity)
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def expected_false_positive_rate(self) -> float:
+        """False positive rate at the current fill level."""
+        return (1 - math.exp(-self.hash_count * self.count / self.size_bits)) ** self.hash_count
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size_bits
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, List, Mapping, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from url_alias.db.database import streaming_session_factory
+
+# Rows fetched per server-side cursor round trip and encoded per response chunk.
+EXPORT_CHUNK_SIZE = 1_000
+
+ExportRows = Callable[[AsyncSession], AsyncIterator[List[Mapping[str, Any]]]]
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _plain(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_ndjson(rows: List[Mapping[str, Any]]) -> str:
+    return "".join(json.dumps({key: _plain(value) for key, value in row.items()}) + "\n" for row in rows)
+
+
+def encode_csv(rows: List[Mapping[str, Any]], fields: Sequence[str]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_plain(row[field]) for field in fields] for row in rows)
+    return buffer.getvalue()
+
+
+def export_response(
+    export_rows: ExportRows,
+    export_format: ExportFormat,
+    fields: Sequence[str],
+    filename: str,
+    session_factory: async_sessionmaker[AsyncSession] = streaming_session_factory,
+) -> StreamingResponse:
+    """
+    Stream rows produced by ``export_rows`` as NDJSON or CSV.
+
+    The body is generated after the endpoint has returned, when the request's own session
+    may already be closed, so the rows are read through a dedicated session that lives as
+    long as the response; by default on the read replica, if one is configured. Only one
+    chunk of rows is held in memory at a time.
+    """
+
+    async def body() -> AsyncIterator[str]:
+        if export_format == ExportFormat.CSV:
+            yield encode_csv([dict(zip(fields, fields))], fields)
+
+        async with session_factory() as session:
+            async for rows in export_rows(session):
+                if export_format == ExportFormat.CSV:
+                    yield encode_csv(rows, fields)
+                else:
+                    yield encode_ndjson(rows)
+
+    attachment = f'filename="{filename}.{export_format.value}"'
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": "attachment; " + attachment},
+    )
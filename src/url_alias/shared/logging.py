@@ -1,14 +1,123 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
-from typing import Optional
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+from url_alias.shared.config import get_config
+from url_alias.shared.prometheus import Counter
+
+config = get_config()
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+log_records_dropped = Counter("url_alias_log_records_dropped", "Log records dropped because the log queue was full.")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any ``extra`` fields of the record as top-level keys."""
+
+    def __init__(self, service_name: Optional[str] = None):
+        super().__init__()
+        self.service_name = service_name
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if self.service_name:
+            entry["service"] = self.service_name
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a share of the records of high-volume loggers.
+
+    The rate of the most specific configured logger name applies, so ``url_alias.aliases``
+    also covers ``url_alias.aliases.reaper`` unless that has a rate of its own. Records at
+    ERROR and above are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, float] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        rate = self._resolved.get(record.name)
+        if rate is None:
+            rate = self._resolved[record.name] = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+    def _rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves all formatting to the listener thread.
+
+    The stock handler formats the message in the logging thread before enqueuing it. This
+    one enqueues the record as is, so its arguments are rendered by the listener: log
+    values, not objects that change right after the call. When the queue is full the
+    record is dropped rather than blocking the caller.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener that waits for room for its stop sentinel instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
 
 class LogConfig:
     """Centralized logging configuration"""
 
+    listener: Optional[QueueListener] = None
+
     @staticmethod
     def setup_logging(
-        level: str = "INFO", format_string: Optional[str] = None, service_name: Optional[str] = None
+        level: str = "INFO",
+        format_string: Optional[str] = None,
+        service_name: Optional[str] = None,
+        json_format: bool = False,
+        use_queue: bool = True,
+        queue_size: int = 10_000,
+        sample_rates: Optional[dict[str, float]] = None,
     ) -> None:
         """Setup logging configuration for the application"""
 
@@ -20,14 +129,36 @@ class LogConfig:
 
         log_level = getattr(logging, level.upper(), logging.INFO)
 
-        logging.basicConfig(
-            level=log_level, format=format_string, datefmt="%Y-%m-%d %H:%M:%S", stream=sys.stdout, force=True
-        )
+        LogConfig.stop_logging()
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        if json_format:
+            stream_handler.setFormatter(JsonFormatter(service_name=service_name))
+        else:
+            stream_handler.setFormatter(logging.Formatter(format_string, datefmt=DATE_FORMAT))
+
+        handler: logging.Handler = stream_handler
+        if use_queue:
+            handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+            LogConfig.listener = DrainingQueueListener(handler.queue, stream_handler)
+            LogConfig.listener.start()
+
+        if sample_rates:
+            handler.addFilter(SamplingFilter(sample_rates))
+
+        logging.basicConfig(level=log_level, handlers=[handler], force=True)
 
         logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
         logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
         logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
+    @staticmethod
+    def stop_logging() -> None:
+        """Write out records still in the queue and stop the listener thread."""
+        if LogConfig.listener is not None:
+            LogConfig.listener.stop()
+            LogConfig.listener = None
+
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the given name"""
@@ -39,4 +170,12 @@ def get_service_logger(service_name: str) -> logging.Logger:
     return logging.getLogger(f"url_alias.{service_name}")
 
 
-LogConfig.setup_logging(service_name="url-alias")
+LogConfig.setup_logging(
+    level=config.logging.LOG_LEVEL,
+    service_name="url-alias",
+    json_format=config.logging.LOG_FORMAT == "json",
+    use_queue=config.logging.LOG_QUEUE_ENABLED,
+    queue_size=config.logging.LOG_QUEUE_SIZE,
+    sample_rates=config.logging.LOG_SAMPLE_RATES,
+)
+atexit.register(LogConfig.stop_logging)
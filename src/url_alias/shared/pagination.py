@@ -0,0 +1,70 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that was not produced by encode_cursor."""
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a keyset-paginated listing. next_cursor is None on the last page."""
+
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page into an opaque, URL-safe token."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Decode a token from encode_cursor back into a sort key of the given types."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError("Malformed cursor")
+
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise InvalidCursorError("Malformed cursor")
+
+    values = []
+    for value, value_type in zip(payload, types):
+        if value_type is datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise InvalidCursorError("Malformed cursor")
+            if value.tzinfo is None:
+                raise InvalidCursorError("Malformed cursor")
+        elif type(value) is not value_type:
+            raise InvalidCursorError("Malformed cursor")
+        values.append(value)
+    return tuple(values)
+
+
+def paginate(rows: List[T], limit: int, *key_fields: str) -> Page[T]:
+    """
+    Build a Page from ``limit + 1`` fetched rows.
+
+    The extra row only signals that another page exists; the cursor is taken from the
+    last row that is returned, using the attributes named in ``key_fields``.
+    """
+    if len(rows) <= limit:
+        return Page(items=rows, next_cursor=None)
+
+    items = rows[:limit]
+    last = items[-1]
+    return Page(items=items, next_cursor=encode_cursor(*(getattr(last, field) for field in key_fields)))
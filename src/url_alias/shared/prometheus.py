@@ -0,0 +1,374 @@
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Iterator, Optional, Sequence
+
+from url_alias.shared.config import get_config
+
+config = get_config()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Upper bounds in seconds, from sub-millisecond pool checkouts up to pool timeouts.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_HEADER = struct.Struct("Q")
+_KEY_LENGTH = struct.Struct("I")
+_VALUE = struct.Struct("d")
+_INITIAL_FILE_SIZE = 64 * 1024
+
+
+def _padded_key_length(length: int) -> int:
+    """Key bytes plus padding, so that the value after them is 8-byte aligned."""
+    return length + (-(_KEY_LENGTH.size + length) % 8)
+
+
+def _iter_entries(data, used: int) -> Iterator[tuple[str, float, int]]:
+    offset = _HEADER.size
+    while offset < used:
+        (length,) = _KEY_LENGTH.unpack_from(data, offset)
+        start = offset + _KEY_LENGTH.size
+        end = start + length
+        position = start + _padded_key_length(length)
+        (value,) = _VALUE.unpack_from(data, position)
+        yield bytes(data[start:end]).decode(), value, position
+        offset = position + _VALUE.size
+
+
+class MmapValues:
+    """
+    Float values by key for one process, in a memory-mapped file other processes can read.
+
+    Entries are appended as (key length, key, padding, value) and never move, so updating
+    a value is a single aligned 8-byte write. The used length in the header is written
+    after an entry is complete, so a reader never sees a partial entry.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        if os.fstat(self._file.fileno()).st_size < _INITIAL_FILE_SIZE:
+            self._file.truncate(_INITIAL_FILE_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        self._positions = {key: position for key, _, position in _iter_entries(self._map, self._used)}
+
+    def add(self, key: str, amount: float) -> None:
+        with self._lock:
+            position = self._positions.get(key) or self._append(key)
+            (current,) = _VALUE.unpack_from(self._map, position)
+            _VALUE.pack_into(self._map, position, current + amount)
+
+    def set(self, key: str, value: float) -> None:
+        with self._lock:
+            position = self._positions.get(key) or self._append(key)
+            _VALUE.pack_into(self._map, position, value)
+
+    def get(self, key: str) -> float:
+        with self._lock:
+            position = self._positions.get(key)
+            return _VALUE.unpack_from(self._map, position)[0] if position else 0.0
+
+    def _append(self, key: str) -> int:
+        encoded = key.encode()
+        start = self._used + _KEY_LENGTH.size
+        end = start + len(encoded)
+        position = start + _padded_key_length(len(encoded))
+        required = position + _VALUE.size
+        if required > len(self._map):
+            size = len(self._map)
+            while size < required:
+                size *= 2
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+
+        _KEY_LENGTH.pack_into(self._map, self._used, len(encoded))
+        self._map[start:end] = encoded
+        _VALUE.pack_into(self._map, position, 0.0)
+        self._used = required
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._positions[key] = position
+        return position
+
+
+def read_values(path: str) -> Iterator[tuple[str, float]]:
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _HEADER.size:
+        return
+    (used,) = _HEADER.unpack_from(data, 0)
+    for key, value, _ in _iter_entries(data, min(used, len(data))):
+        yield key, value
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels: Sequence[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    escaped = ((name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for name, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class MetricsRegistry:
+    """
+    Metrics of all worker processes of one server.
+
+    Each process writes its own values to ``<directory>/<pid>.db``; collect() reads every
+    file and adds them up, so any worker can answer a scrape for all of them. Counters and
+    histograms of processes that have exited are kept, which keeps totals monotonic when
+    workers are restarted. Gauges only count live processes.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self.metrics: dict[str, "Metric"] = {}
+        self._values: Optional[MmapValues] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def values(self) -> MmapValues:
+        pid = os.getpid()
+        if self._pid != pid:
+            os.makedirs(self.directory, exist_ok=True)
+            self._values = MmapValues(os.path.join(self.directory, f"{pid}.db"))
+            self._pid = pid
+        return self._values
+
+    def register(self, metric: "Metric") -> None:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+    def collect(self) -> str:
+        samples: dict[tuple[str, str, tuple], float] = {}
+        live_gauges: dict[tuple[str, str, tuple], list[float]] = defaultdict(list)
+
+        for filename in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            pid, _, extension = filename.partition(".")
+            if extension != "db" or not pid.isdigit():
+                continue
+            alive = _process_alive(int(pid))
+            for key, value in read_values(os.path.join(self.directory, filename)):
+                name, sample, labels = json.loads(key)
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                sample_key = (name, sample, tuple(map(tuple, labels)))
+                if metric.type == "gauge":
+                    if alive:
+                        live_gauges[sample_key].append(value)
+                else:
+                    samples[sample_key] = samples.get(sample_key, 0.0) + value
+
+        for sample_key, values in live_gauges.items():
+            samples[sample_key] = self.metrics[sample_key[0]].combine(values)
+
+        lines = []
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            own = {key: value for key, value in samples.items() if key[0] == name}
+            lines.extend(metric.render(own))
+        return "\n".join(lines) + "\n"
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry or metrics_registry
+        self._children: dict[tuple[str, ...], object] = {}
+        self.registry.register(self)
+
+    def labels(self, *values: str):
+        """Child metric for one combination of label values; cheap to call on every update."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._child(list(zip(self.labelnames, map(str, values))))
+        return child
+
+    def _key(self, sample: str, labels: list) -> str:
+        return json.dumps([self.name, sample, labels])
+
+    def _child(self, labels: list):
+        raise NotImplementedError
+
+    def render(self, samples: dict) -> list[str]:
+        return [
+            f"{name}{sample}{_format_labels(labels)} {_format_value(value)}"
+            for (name, sample, labels), value in sorted(samples.items())
+        ]
+
+
+class _CounterChild:
+    __slots__ = ("registry", "key")
+
+    def __init__(self, registry: MetricsRegistry, key: str):
+        self.registry = registry
+        self.key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        if self.registry.enabled:
+            self.registry.values.add(self.key, amount)
+
+    def value(self) -> float:
+        """This process's count."""
+        return self.registry.values.get(self.key) if self.registry.enabled else 0.0
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _child(self, labels: list) -> _CounterChild:
+        return _CounterChild(self.registry, self._key("_total", labels))
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("registry", "key")
+
+    def __init__(self, registry: MetricsRegistry, key: str):
+        self.registry = registry
+        self.key = key
+
+    def set(self, value: float) -> None:
+        if self.registry.enabled:
+            self.registry.values.set(self.key, value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        if self.registry.enabled:
+            self.registry.values.add(self.key, amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class Gauge(Metric):
+    """
+    Gauge with one value per live process, reported as their sum, or their maximum for
+    values that every process measures on its own (``multiprocess_mode="max"``).
+    """
+
+    type = "gauge"
+
+    def __init__(self, *args, multiprocess_mode: str = "sum", **kwargs):
+        self.combine = max if multiprocess_mode == "max" else sum
+        super().__init__(*args, **kwargs)
+
+    def _child(self, labels: list) -> _GaugeChild:
+        return _GaugeChild(self.registry, self._key("", labels))
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("registry", "bounds", "bucket_keys", "sum_key", "count_key")
+
+    def __init__(self, registry: MetricsRegistry, bounds: tuple, bucket_keys: list, sum_key: str, count_key: str):
+        self.registry = registry
+        self.bounds = bounds
+        self.bucket_keys = bucket_keys
+        self.sum_key = sum_key
+        self.count_key = count_key
+
+    def observe(self, value: float) -> None:
+        if not self.registry.enabled:
+            return
+        values = self.registry.values
+        values.add(self.bucket_keys[bisect_left(self.bounds, value)], 1.0)
+        values.add(self.sum_key, value)
+        values.add(self.count_key, 1.0)
+
+    def snapshot(self) -> dict[str, Any]:
+        """This process's observations: cumulative counts by upper bound ("le"), the count and the sum."""
+        if not self.registry.enabled:
+            return {"buckets": {}, "count": 0, "sum": 0.0}
+        values = self.registry.values
+        buckets, running = {}, 0
+        for bound, key in zip(self.bounds, self.bucket_keys):
+            running += int(values.get(key))
+            buckets["+Inf" if math.isinf(bound) else str(bound)] = running
+        return {"buckets": buckets, "count": running, "sum": values.get(self.sum_key)}
+
+
+class Histogram(Metric):
+    """Histogram in Prometheus' layout. Buckets are stored per bound and made cumulative when collected."""
+
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs):
+        self.bounds = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(*args, **kwargs)
+
+    def _child(self, labels: list) -> _HistogramChild:
+        bucket_keys = [self._key("_bucket", labels + [["le", _format_value(bound)]]) for bound in self.bounds]
+        return _HistogramChild(
+            self.registry, self.bounds, bucket_keys, self._key("_sum", labels), self._key("_count", labels)
+        )
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self, samples: dict) -> list[str]:
+        series: dict[tuple, dict] = defaultdict(dict)
+        for (name, sample, labels), value in samples.items():
+            if sample == "_bucket":
+                series[labels[:-1]][float(labels[-1][1])] = value
+            else:
+                series[labels][sample] = value
+
+        lines = []
+        for labels in sorted(series):
+            values = series[labels]
+            running = 0.0
+            for bound in self.bounds:
+                running += values.get(bound, 0.0)
+                bucket_labels = labels + (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {_format_value(running)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(values.get('_sum', 0.0))}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_format_value(values.get('_count', 0.0))}")
+        return lines
+
+
+def _default_directory() -> str:
+    # Worker processes share their parent, so they share this directory without configuration,
+    # while separate servers on the same host do not.
+    return os.path.join(tempfile.gettempdir(), f"url-alias-metrics-{os.getppid()}")
+
+
+metrics_registry = MetricsRegistry(
+    directory=config.metrics.METRICS_DIR or _default_directory(),
+    enabled=config.metrics.METRICS_ENABLED,
+)
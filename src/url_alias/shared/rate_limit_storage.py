@@ -0,0 +1,412 @@
+import asyncio
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from math import floor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from urllib.parse import urlparse
+
+import asyncpg
+from limits.storage import SlidingWindowCounterSupport, Storage
+
+from url_alias.shared.background import PeriodicTask
+from url_alias.shared.logging import get_logger
+from url_alias.shared.prometheus import Counter
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+rate_limit_evictions = Counter(
+    "url_alias_rate_limit_evictions",
+    "Rate limit counters evicted from the shared table before they expired, to make room for another client.",
+)
+
+
+def _previous_window_ttl(now: float, expiry: int) -> float:
+    return (1 - (((now - expiry) / expiry) % 1)) * expiry
+
+
+def _current_window_ttl(now: float, expiry: int) -> float:
+    return (1 - ((now / expiry) % 1)) * expiry + expiry
+
+
+def _roll(window: int, previous: int, current: int, now_window: int) -> tuple[int, int]:
+    """Counts of the previous and current window as of ``now_window``, from counts stored for ``window``."""
+    if window == now_window:
+        return previous, current
+    if window == now_window - 1:
+        return current, 0
+    return 0, 0
+
+
+def _sliding_window(previous: int, current: int, now: float, expiry: int) -> tuple[int, float, int, float]:
+    # Same shape and TTLs as limits' MemoryStorage, so the strategy computes the same remaining counts.
+    previous_ttl = _previous_window_ttl(now, expiry) if previous else 0.0
+    return previous, previous_ttl, current, _current_window_ttl(now, expiry)
+
+
+@lru_cache(maxsize=4096)
+def _fingerprint(key: str) -> int:
+    # Python's hash() is salted per process, and every worker must find the same slot.
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+_MAGIC = b"urlrl\x00\x00\x01"
+_FILE_HEADER = struct.Struct("<8sQ")
+_HEADER_SIZE = 64
+BUCKET_SLOTS = 8
+_FINGERPRINTS = struct.Struct(f"<{BUCKET_SLOTS}Q")
+_FINGERPRINT = struct.Struct("<Q")
+# Window index (fixed windows: unused), previous count, current count, expires at, last used.
+_SLOT = struct.Struct("<qIIdd")
+_EMPTY_SLOT = bytes(_FINGERPRINT.size + _SLOT.size)
+BUCKET_SIZE = _FINGERPRINTS.size + BUCKET_SLOTS * _SLOT.size
+SLOT_SIZE = BUCKET_SIZE // BUCKET_SLOTS
+
+
+class SharedMemoryStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Rate limit counters in a fixed-size table in a memory-mapped file, shared by the worker
+    processes on one host. Registered as ``mmap://<path>``.
+
+    The table is split into buckets of BUCKET_SLOTS slots. A key is stored under a 64-bit
+    fingerprint in the bucket the fingerprint points to; when the bucket is full, the slot
+    of an expired counter is reused, or else the least recently used one. Memory is fixed
+    at ``slots * SLOT_SIZE`` bytes however many clients there are; a client whose counter
+    was evicted starts over with a fresh window. Each update holds a ``lockf`` lock on its
+    bucket, so processes only wait for each other on the same bucket.
+    """
+
+    STORAGE_SCHEME = ["mmap"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, slots: int = 65_536, **options: Any):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = urlparse(uri).path
+        self.buckets = max(1, -(-slots // BUCKET_SLOTS))
+        self._lock = threading.Lock()
+        self._open()
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return OSError
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = _HEADER_SIZE + self.buckets * BUCKET_SIZE
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, _FILE_HEADER.size, 0)
+            if header != _FILE_HEADER.pack(_MAGIC, self.buckets) or os.fstat(self._fd).st_size != size:
+                # New file, or one left by a server with another table size: start empty.
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, _FILE_HEADER.pack(_MAGIC, self.buckets), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+
+    def close(self) -> None:
+        with self._lock:
+            self._map.close()
+            os.close(self._fd)
+
+    def _slot(self, fingerprint: int, now: float, create: bool) -> tuple[int, Optional[tuple]]:
+        """
+        Offset of the record of the key with this fingerprint and its live values, or None if
+        it has none. With ``create`` a slot is claimed for a missing key and its offset returned
+        with None; otherwise the offset is -1. Must be called with the bucket locked.
+        """
+        bucket = _HEADER_SIZE + (fingerprint % self.buckets) * BUCKET_SIZE
+        records = bucket + _FINGERPRINTS.size
+        fingerprints = _FINGERPRINTS.unpack_from(self._map, bucket)
+        if fingerprint in fingerprints:
+            offset = records + fingerprints.index(fingerprint) * _SLOT.size
+            record = _SLOT.unpack_from(self._map, offset)
+            if record[3] > now:
+                return offset, record
+            if create:
+                return offset, None
+            return -1, None
+        if not create:
+            return -1, None
+
+        victim, victim_used = 0, None
+        for index in range(BUCKET_SLOTS):
+            _, _, _, expires_at, last_used = _SLOT.unpack_from(self._map, records + index * _SLOT.size)
+            if expires_at <= now:
+                victim, victim_used = index, None
+                break
+            if victim_used is None or last_used < victim_used:
+                victim, victim_used = index, last_used
+        if victim_used is not None:
+            rate_limit_evictions.inc()
+        _FINGERPRINT.pack_into(self._map, bucket + victim * _FINGERPRINT.size, fingerprint)
+        return records + victim * _SLOT.size, None
+
+    def _locked(self, key: str, update: Callable[[int, float], T]) -> T:
+        """Run ``update(fingerprint, now)`` with the key's bucket locked against threads and other processes."""
+        fingerprint = _fingerprint(key)
+        bucket = _HEADER_SIZE + (fingerprint % self.buckets) * BUCKET_SIZE
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, BUCKET_SIZE, bucket)
+            try:
+                return update(fingerprint, time.time())
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, BUCKET_SIZE, bucket)
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+
+        def update(fingerprint: int, now: float) -> bool:
+            offset, record = self._slot(fingerprint, now, create=True)
+            now_window = int(now / expiry)
+            previous, current = _roll(record[0], record[1], record[2], now_window) if record else (0, 0)
+            weighted_count = previous * _previous_window_ttl(now, expiry) / expiry + current
+            if floor(weighted_count) + amount > limit:
+                return False
+            _SLOT.pack_into(self._map, offset, now_window, previous, current + amount, (now_window + 2) * expiry, now)
+            return True
+
+        return self._locked(key, update)
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        def read(fingerprint: int, now: float) -> tuple[int, float, int, float]:
+            _, record = self._slot(fingerprint, now, create=False)
+            previous, current = _roll(record[0], record[1], record[2], int(now / expiry)) if record else (0, 0)
+            return _sliding_window(previous, current, now, expiry)
+
+        return self._locked(key, read)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.clear(key)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        def update(fingerprint: int, now: float) -> int:
+            offset, record = self._slot(fingerprint, now, create=True)
+            count, expires_at = (record[2] + amount, record[3]) if record else (amount, now + expiry)
+            _SLOT.pack_into(self._map, offset, 0, 0, count, expires_at, now)
+            return count
+
+        return self._locked(key, update)
+
+    def get(self, key: str) -> int:
+        return self._locked(key, lambda fingerprint, now: (self._slot(fingerprint, now, False)[1] or (0, 0, 0))[2])
+
+    def get_expiry(self, key: str) -> float:
+        return self._locked(key, lambda fingerprint, now: (self._slot(fingerprint, now, False)[1] or (0, 0, 0, now))[3])
+
+    def clear(self, key: str) -> None:
+        def update(fingerprint: int, now: float) -> None:
+            offset, _ = self._slot(fingerprint, now, create=False)
+            if offset >= 0:
+                _SLOT.pack_into(self._map, offset, 0, 0, 0, 0.0, 0.0)
+
+        self._locked(key, update)
+
+    def check(self) -> bool:
+        return not self._map.closed
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                self._map[_HEADER_SIZE:] = _EMPTY_SLOT * (self.buckets * BUCKET_SLOTS)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        return None
+
+
+# One statement per check: roll the windows, decide and count the hit, all under the row lock
+# taken by the upsert. The decision is stored in last_hit_allowed, which is what RETURNING sees.
+_ACQUIRE_SQL = """
+INSERT INTO rate_limit_counters AS c (key, window_index, previous_count, current_count, last_hit_allowed, expires_at)
+VALUES ($1, $2, 0, $4, true, $6)
+ON CONFLICT (key) DO UPDATE SET (window_index, previous_count, current_count, last_hit_allowed, expires_at) = (
+    SELECT $2, rolled.previous_count, rolled.current_count + CASE WHEN rolled.allowed THEN $4 ELSE 0 END,
+           rolled.allowed, $6
+    FROM (
+        SELECT counts.previous_count, counts.current_count,
+               floor(counts.previous_count * $3::float8 + counts.current_count) + $4 <= $5 AS allowed
+        FROM (
+            SELECT CASE c.window_index WHEN $2 THEN c.previous_count WHEN $2 - 1 THEN c.current_count ELSE 0 END
+                       AS previous_count,
+                   CASE c.window_index WHEN $2 THEN c.current_count ELSE 0 END AS current_count
+        ) AS counts
+    ) AS rolled
+)
+RETURNING last_hit_allowed
+"""
+_GET_WINDOW_SQL = """
+SELECT window_index, previous_count, current_count FROM rate_limit_counters WHERE key = $1 AND expires_at > $2
+"""
+_INCR_SQL = """
+INSERT INTO rate_limit_counters AS c (key, window_index, previous_count, current_count, last_hit_allowed, expires_at)
+VALUES ($1, 0, 0, $2, true, $4)
+ON CONFLICT (key) DO UPDATE SET
+    current_count = CASE WHEN c.expires_at > $3 THEN c.current_count + $2 ELSE $2 END,
+    expires_at = CASE WHEN c.expires_at > $3 THEN c.expires_at ELSE $4 END
+RETURNING current_count
+"""
+_GET_SQL = "SELECT current_count, expires_at FROM rate_limit_counters WHERE key = $1 AND expires_at > $2"
+_CLEAR_SQL = "DELETE FROM rate_limit_counters WHERE key = $1"
+_RESET_SQL = "DELETE FROM rate_limit_counters"
+_PURGE_SQL = "DELETE FROM rate_limit_counters WHERE expires_at <= $1"
+
+
+def _timestamp(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds, timezone.utc)
+
+
+class PostgresStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Rate limit counters in the ``rate_limit_counters`` table, shared by every server using
+    the database. Registered as ``postgresql://...``.
+
+    slowapi checks limits synchronously, so queries run on an event loop in a background
+    thread and the calling thread waits for them for up to ``timeout`` seconds: one round
+    trip per check. Called on a server's event loop, that wait stalls every request the
+    worker is serving, which is why check_rate_limit makes the call from a thread. Expired
+    rows are deleted every ``purge_interval`` seconds, which keeps the table at about the
+    number of clients seen in the longest window.
+    """
+
+    STORAGE_SCHEME = ["postgresql"]
+    MAX_CONNECTIONS = 4
+
+    def __init__(
+        self,
+        uri: str,
+        wrap_exceptions: bool = False,
+        timeout: float = 0.5,
+        purge_interval: float = 60.0,
+        server_settings: Optional[dict[str, str]] = None,
+        **options: Any,
+    ):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.dsn = uri
+        self.timeout = timeout
+        self.server_settings = server_settings
+        self._purge_task = PeriodicTask("rate-limit-purge", self._purge, purge_interval)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pool_task: Optional[asyncio.Task] = None
+
+    @property
+    def base_exceptions(self) -> tuple[type[Exception], ...]:
+        return asyncpg.PostgresError, asyncpg.InterfaceError, OSError, TimeoutError
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="rate-limit-storage", daemon=True)
+                self._thread.start()
+                self._pool_task = None
+            return self._loop
+
+    def _run(self, coroutine: Callable[..., Awaitable[T]], *args: Any, timeout: Optional[float] = None) -> T:
+        future = asyncio.run_coroutine_threadsafe(coroutine(*args), self._event_loop())
+        try:
+            return future.result(timeout or self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def _pool_ready(self) -> bool:
+        task = self._pool_task
+        return task is not None and task.done() and not task.cancelled() and task.exception() is None
+
+    async def _pool(self) -> asyncpg.Pool:
+        # The pool is created by a task of its own, so a check that times out does not abort it.
+        if self._pool_task is None or (self._pool_task.done() and not self._pool_ready()):
+            self._pool_task = asyncio.ensure_future(
+                asyncpg.create_pool(
+                    self.dsn, min_size=1, max_size=self.MAX_CONNECTIONS, server_settings=self.server_settings
+                )
+            )
+        pool = await asyncio.shield(self._pool_task)
+        self._purge_task.start()
+        return pool
+
+    async def _fetchval(self, query: str, *args: Any) -> Any:
+        return await (await self._pool()).fetchval(query, *args)
+
+    async def _fetchrow(self, query: str, *args: Any) -> Optional[asyncpg.Record]:
+        return await (await self._pool()).fetchrow(query, *args)
+
+    async def _execute(self, query: str, *args: Any) -> str:
+        return await (await self._pool()).execute(query, *args)
+
+    async def _purge(self) -> None:
+        status = await self._execute(_PURGE_SQL, _timestamp(time.time()))
+        logger.debug("Purged expired rate limit counters: %s", status)
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        now_window = int(now / expiry)
+        previous_weight = _previous_window_ttl(now, expiry) / expiry
+        expires_at = _timestamp((now_window + 2) * expiry)
+        return self._run(self._fetchval, _ACQUIRE_SQL, key, now_window, previous_weight, amount, limit, expires_at)
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        now = time.time()
+        row = self._run(self._fetchrow, _GET_WINDOW_SQL, key, _timestamp(now))
+        previous, current = _roll(row[0], row[1], row[2], int(now / expiry)) if row else (0, 0)
+        return _sliding_window(previous, current, now, expiry)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.clear(key)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        return self._run(self._fetchval, _INCR_SQL, key, amount, _timestamp(now), _timestamp(now + expiry))
+
+    def get(self, key: str) -> int:
+        row = self._run(self._fetchrow, _GET_SQL, key, _timestamp(time.time()))
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._run(self._fetchrow, _GET_SQL, key, _timestamp(now))
+        return row[1].timestamp() if row else now
+
+    def clear(self, key: str) -> None:
+        self._run(self._execute, _CLEAR_SQL, key)
+
+    def check(self) -> bool:
+        try:
+            return self._run(self._fetchval, "SELECT 1") == 1
+        except Exception:
+            return False
+
+    def reset(self) -> Optional[int]:
+        status = self._run(self._execute, _RESET_SQL)
+        return int(status.rpartition(" ")[2])
+
+    def close(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            return
+
+        async def shutdown() -> None:
+            await self._purge_task.stop()
+            if self._pool_ready():
+                await self._pool_task.result().close()
+
+        try:
+            self._run(shutdown, timeout=5.0)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5.0)
+            self._thread = None
@@ -1,4 +1,81 @@
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+from url_alias.shared.config import get_config
+from url_alias.shared.rate_limit_storage import PostgresStorage, SharedMemoryStorage
+
+config = get_config()
+
+REDIRECT_RATE_LIMIT = "30/minute"
+
+
+def _default_file() -> str:
+    # Worker processes share their parent, so they share this file without configuration.
+    return os.path.join(tempfile.gettempdir(), f"url-alias-rate-limits-{os.getppid()}.bin")
+
+
+def _storage() -> tuple[str, dict[str, Any]]:
+    """Storage URI and options for the configured RATE_LIMIT_STORAGE."""
+    settings = config.rate_limit
+    if settings.RATE_LIMIT_STORAGE == "shared":
+        path = os.path.abspath(settings.RATE_LIMIT_FILE or _default_file())
+        return "mmap://" + path, {"slots": settings.RATE_LIMIT_SLOTS}
+    if settings.RATE_LIMIT_STORAGE == "postgres":
+        return config.db.asyncpg_dsn, {
+            "timeout": settings.RATE_LIMIT_POSTGRES_TIMEOUT_SECONDS,
+            "purge_interval": settings.RATE_LIMIT_POSTGRES_PURGE_INTERVAL_SECONDS,
+            "server_settings": config.db.server_settings,
+        }
+    return "memory://", {}
+
+
+storage_uri, storage_options = _storage()
+
+limiter = Limiter(
+    key_func=get_remote_address,
+    strategy="sliding-window-counter",
+    storage_uri=storage_uri,
+    storage_options=storage_options,
+    # Count in this process while Postgres is unreachable, rather than failing requests.
+    in_memory_fallback_enabled=config.rate_limit.RATE_LIMIT_STORAGE == "postgres",
+)
+
+# PostgresStorage makes its caller wait for the query, so checks against it wait in these
+# threads rather than on the event loop. One per connection the storage may open.
+check_executor = ThreadPoolExecutor(max_workers=PostgresStorage.MAX_CONNECTIONS, thread_name_prefix="rate-limit-check")
+
+
+async def check_rate_limit(request: Request) -> None:
+    """
+    Check the limits of the request's endpoint before its @limiter.limit wrapper runs, so the
+    wrapper skips its own check. Raises RateLimitExceeded.
+
+    Meant as a route dependency. With the postgres storage the check runs in check_executor
+    and the event loop serves other requests during the round trip; the other storages
+    answer in microseconds and are checked inline.
+
+    _check_request_limit, _storage and state._rate_limiting_complete are slowapi internals,
+    which is why pyproject.toml keeps slowapi below 0.2.
+    """
+    endpoint = request.scope["endpoint"]
+    if isinstance(limiter._storage, PostgresStorage):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(check_executor, limiter._check_request_limit, request, endpoint, False)
+    else:
+        limiter._check_request_limit(request, endpoint, False)
+    request.state._rate_limiting_complete = True
+
 
-limiter = Limiter(key_func=get_remote_address)
+def close_limiter_storage() -> None:
+    """Release the mapped file or database connections behind the limiter in this process."""
+    check_executor.shutdown(wait=False, cancel_futures=True)
+    storage = limiter._storage
+    if isinstance(storage, (SharedMemoryStorage, PostgresStorage)):
+        storage.close()
@@ -0,0 +1,19 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class RowsJSONResponse(JSONResponse):
+    """
+    JSONResponse for listings built from plain dicts of database rows.
+
+    An endpoint that returns this response directly skips the per-item pydantic models
+    and FastAPI's second validation against ``response_model``; the rows are encoded in one
+    call by pydantic-core's serializer, which writes datetimes exactly as the schemas do.
+    ``response_model`` still documents the schema, so the rows must have the same keys, in
+    the same order, as the schema they stand in for.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)